@@ -0,0 +1,37 @@
+"""
+Microbenchmark of Piece.get_possible_positions_to_move.
+
+Run from the repository root with:
+    python -m benchmarks.move_generation
+"""
+import timeit
+
+from chess.models import POSITIONS, ChessColor
+from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rock
+
+NUMBER_OF_ROUNDS = 50
+
+
+def benchmark_piece(piece_class) -> float:
+    pieces = [
+        piece_class(color=color, current_position=position)
+        for color in ChessColor
+        for position in POSITIONS
+    ]
+
+    def generate():
+        for piece in pieces:
+            piece.get_possible_positions_to_move()
+
+    seconds = timeit.timeit(generate, number=NUMBER_OF_ROUNDS)
+    return len(pieces) * NUMBER_OF_ROUNDS / seconds
+
+
+def main():
+    for piece_class in [Pawn, Knight, Bishop, Rock, Queen, King]:
+        generations_per_second = benchmark_piece(piece_class)
+        print(f"{piece_class.__name__:<8}{generations_per_second:>14,.0f} gen/s")
+
+
+if __name__ == "__main__":
+    main()
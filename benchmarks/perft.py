@@ -0,0 +1,82 @@
+"""
+Perft over reference positions with known node counts.
+
+Counts every legal move sequence up to a depth and compares the number of
+leaf positions with the published references, so it is both a throughput
+measure of the move generator and a regression check. Exits with status 1
+when a count differs.
+
+Run from the repository root with:
+    python -m benchmarks.perft [max_depth] [--workers N]
+
+With more than one worker the root moves are split across a process pool.
+"""
+import argparse
+import sys
+import time
+
+from chess.game import Game
+
+DEFAULT_MAX_DEPTH = 3
+
+# Name, FEN and node counts from depth 1
+REFERENCE_POSITIONS = [
+    (
+        "initial",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        [20, 400, 8902, 197281, 4865609],
+    ),
+    (
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        [48, 2039, 97862, 4085603],
+    ),
+    (
+        "position 3",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        [14, 191, 2812, 43238, 674624],
+    ),
+    (
+        "position 5",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        [44, 1486, 62379, 2103487],
+    ),
+    (
+        "position 6",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        [46, 2079, 89890, 3894594],
+    ),
+]
+
+
+def main(max_depth: int = DEFAULT_MAX_DEPTH, max_workers: int = 1) -> int:
+    failures = 0
+    total_nodes = 0
+    total_seconds = 0.0
+    for name, fen, expected_counts in REFERENCE_POSITIONS:
+        game = Game(fen=fen)
+        for depth, expected in enumerate(expected_counts[:max_depth], start=1):
+            start = time.perf_counter()
+            nodes = game.perft(depth, max_workers)
+            seconds = time.perf_counter() - start
+            total_nodes += nodes
+            total_seconds += seconds
+
+            status = "ok" if nodes == expected else f"FAILED, expected {expected}"
+            failures += nodes != expected
+            print(
+                f"{name:<12}depth {depth}{nodes:>12,} nodes"
+                f"{nodes / seconds:>14,.0f} nodes/s  {status}"
+            )
+
+    print(f"\n{total_nodes:,} nodes in {total_seconds:.2f}s", end="")
+    print(f", {total_nodes / total_seconds:,.0f} nodes/s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("max_depth", nargs="?", type=int, default=DEFAULT_MAX_DEPTH)
+    parser.add_argument("--workers", type=int, default=1)
+    arguments = parser.parse_args()
+    sys.exit(main(arguments.max_depth, arguments.workers))
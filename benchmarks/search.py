@@ -0,0 +1,47 @@
+"""
+Nodes searched at a fixed depth with and without move ordering.
+
+Runs the alpha-beta search over the perft reference positions, once trying
+only the previous principal variation first and once with hash moves,
+MVV-LVA, killers and history, and reports the node reduction.
+
+Run from the repository root with:
+    python -m benchmarks.search [depth]
+"""
+import argparse
+
+from benchmarks.perft import REFERENCE_POSITIONS
+from chess.game import Game
+from chess.search import Search
+
+DEFAULT_DEPTH = 4
+
+
+def main(depth: int = DEFAULT_DEPTH):
+    total_nodes = {False: 0, True: 0}
+    for name, fen, _ in REFERENCE_POSITIONS:
+        nodes = dict()
+        for move_ordering in (False, True):
+            result = Search(Game(fen=fen), move_ordering=move_ordering).search(
+                max_depth=depth
+            )
+            nodes[move_ordering] = result.nodes
+            total_nodes[move_ordering] += result.nodes
+
+        reduction = 1 - nodes[True] / nodes[False]
+        print(
+            f"{name:<12}depth {depth}{nodes[False]:>10,} nodes unordered"
+            f"{nodes[True]:>10,} nodes ordered{reduction:>8.1%} fewer"
+        )
+
+    reduction = 1 - total_nodes[True] / total_nodes[False]
+    print(
+        f"\n{total_nodes[False]:,} nodes unordered, {total_nodes[True]:,} ordered, "
+        f"{reduction:.1%} fewer"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("depth", nargs="?", type=int, default=DEFAULT_DEPTH)
+    main(parser.parse_args().depth)
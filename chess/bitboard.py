@@ -0,0 +1,157 @@
+from chess.models import NEIGHBOURS, POSITIONS, RAYS, ChessColor, Direction, Position
+
+# A bitboard is an int whose bit i is set when the square of index i is in the set.
+# Index 0 is a1, 7 is h1 and 63 is h8, as in Position.index
+EMPTY_BOARD = 0
+FULL_BOARD = (1 << 64) - 1
+SQUARE_MASKS: tuple[int, ...] = tuple(1 << i for i in range(64))
+
+
+def positions_2_bitboard(positions) -> int:
+    bitboard = EMPTY_BOARD
+    for position in positions:
+        bitboard |= SQUARE_MASKS[position.index]
+    return bitboard
+
+
+def iter_indexes(bitboard: int):
+    while bitboard:
+        lowest_bit = bitboard & -bitboard
+        yield lowest_bit.bit_length() - 1
+        bitboard ^= lowest_bit
+
+
+def bitboard_2_positions(bitboard: int) -> list[Position]:
+    return [POSITIONS[i] for i in iter_indexes(bitboard)]
+
+
+def count_bits(bitboard: int) -> int:
+    return bitboard.bit_count()
+
+
+RAY_MASKS: dict[Direction, tuple[int, ...]] = {
+    direction: tuple(positions_2_bitboard(ray) for ray in rays)
+    for direction, rays in RAYS.items()
+}
+
+
+def _build_between_and_line_masks():
+    between = [[0] * 64 for _ in range(64)]
+    lines = [[0] * 64 for _ in range(64)]
+    for direction, rays in RAYS.items():
+        x, y = direction.value
+        opposite_rays = RAY_MASKS[Direction((-x, -y))]
+        for origin in range(64):
+            line = RAY_MASKS[direction][origin] | opposite_rays[origin]
+            line |= SQUARE_MASKS[origin]
+            path = 0
+            for position in rays[origin]:
+                between[origin][position.index] = path
+                lines[origin][position.index] = line
+                path |= SQUARE_MASKS[position.index]
+    return tuple(map(tuple, between)), tuple(map(tuple, lines))
+
+
+# BETWEEN_MASKS[a][b] has the squares strictly between a and b and
+# LINE_MASKS[a][b] the whole line through them, both are empty when the
+# squares are not on a common row, column or diagonal
+BETWEEN_MASKS, LINE_MASKS = _build_between_and_line_masks()
+
+
+def are_aligned(origin: int, destination: int) -> bool:
+    return LINE_MASKS[origin][destination] != 0
+
+
+KING_ATTACKS: tuple[int, ...] = tuple(
+    positions_2_bitboard(
+        NEIGHBOURS[d][p.index] for d in Direction if NEIGHBOURS[d][p.index] is not None
+    )
+    for p in POSITIONS
+)
+
+_KNIGHT_JUMPS = [(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)]
+KNIGHT_ATTACKS: tuple[int, ...] = tuple(
+    sum(
+        SQUARE_MASKS[(x + dx - 1) + 8 * (y + dy - 1)]
+        for dx, dy in _KNIGHT_JUMPS
+        if 1 <= x + dx <= 8 and 1 <= y + dy <= 8
+    )
+    for x, y in (p.coordinates for p in POSITIONS)
+)
+
+PAWN_ATTACKS: dict[ChessColor, tuple[int, ...]] = {
+    color: tuple(
+        positions_2_bitboard(
+            NEIGHBOURS[d][p.index]
+            for d in diagonals
+            if NEIGHBOURS[d][p.index] is not None
+        )
+        for p in POSITIONS
+    )
+    for color, diagonals in [
+        (ChessColor.WHITE, (Direction.LEFT_UP, Direction.RIGHT_UP)),
+        (ChessColor.BLACK, (Direction.LEFT_DOWN, Direction.RIGHT_DOWN)),
+    ]
+}
+
+
+def _build_line_attacks(first: Direction, second: Direction):
+    """
+    For every square, maps the occupancy of the line through it
+    (the two rays in first and second directions) to the attacked squares.
+    Edge squares never change the attacks, so they are left out of the mask.
+    """
+    masks = list()
+    tables = list()
+    for p in POSITIONS:
+        rays = [RAYS[first][p.index], RAYS[second][p.index]]
+        inner_squares = [s for ray in rays for s in ray[:-1]]
+        mask = positions_2_bitboard(inner_squares)
+
+        table = dict()
+        # Enumerate every subset of the mask (Carry-Rippler)
+        occupancy = 0
+        while True:
+            attacks = 0
+            for ray in rays:
+                for s in ray:
+                    attacks |= SQUARE_MASKS[s.index]
+                    if occupancy & SQUARE_MASKS[s.index]:
+                        break
+            table[occupancy] = attacks
+            occupancy = (occupancy - mask) & mask
+            if occupancy == 0:
+                break
+
+        masks.append(mask)
+        tables.append(table)
+
+    return tuple(masks), tuple(tables)
+
+
+_FILE_MASKS, _FILE_ATTACKS = _build_line_attacks(Direction.UP, Direction.DOWN)
+_RANK_MASKS, _RANK_ATTACKS = _build_line_attacks(Direction.LEFT, Direction.RIGHT)
+_DIAGONAL_MASKS, _DIAGONAL_ATTACKS = _build_line_attacks(
+    Direction.LEFT_UP, Direction.RIGHT_DOWN
+)
+_ANTI_DIAGONAL_MASKS, _ANTI_DIAGONAL_ATTACKS = _build_line_attacks(
+    Direction.LEFT_DOWN, Direction.RIGHT_UP
+)
+
+
+def rock_attacks(index: int, occupancy: int) -> int:
+    return (
+        _FILE_ATTACKS[index][occupancy & _FILE_MASKS[index]]
+        | _RANK_ATTACKS[index][occupancy & _RANK_MASKS[index]]
+    )
+
+
+def bishop_attacks(index: int, occupancy: int) -> int:
+    return (
+        _DIAGONAL_ATTACKS[index][occupancy & _DIAGONAL_MASKS[index]]
+        | _ANTI_DIAGONAL_ATTACKS[index][occupancy & _ANTI_DIAGONAL_MASKS[index]]
+    )
+
+
+def queen_attacks(index: int, occupancy: int) -> int:
+    return rock_attacks(index, occupancy) | bishop_attacks(index, occupancy)
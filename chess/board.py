@@ -1,28 +1,367 @@
 from copy import deepcopy
+from typing import NamedTuple
+
+from chess.bitboard import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    SQUARE_MASKS,
+    bishop_attacks,
+    rock_attacks,
+)
+from chess.fen import get_fen, parse_fen
 from chess.models import (
     ChessColor,
+    Move,
     Position,
     coordinates_2_position,
     name_2_position,
+    opponent_color,
+)
+from chess.pieces import (
+    PIECE_CLASSES,
+    Bishop,
+    King,
+    Knight,
+    Pawn,
+    Piece,
+    Queen,
+    Rock,
 )
-from chess.pieces import Bishop, King, Knight, Pawn, Piece, Queen, Rock
+from chess.piece_square import ENDGAME_SCORES, MIDGAME_SCORES, PHASE_WEIGHTS
+from chess.zobrist import CASTLING_KEYS, EN_PASSANT_KEYS, PIECE_KEYS, SIDE_KEY
+
+# Bits of the number of attackers of a square, up to 31 attackers
+ATTACK_COUNT_BITS = 5
+
+# Castling right bit, king position, rock position and color of each castling
+CASTLING_RIGHTS = [
+    (1, "e1", "h1", ChessColor.WHITE),
+    (2, "e1", "a1", ChessColor.WHITE),
+    (4, "e8", "h8", ChessColor.BLACK),
+    (8, "e8", "a8", ChessColor.BLACK),
+]
+
+# Rock origin and destination of a castling, by destination of the king
+CASTLING_ROCK_MOVES = {
+    "g1": ("h1", "f1"),
+    "c1": ("a1", "d1"),
+    "g8": ("h8", "f8"),
+    "c8": ("a8", "d8"),
+}
+
+
+class MoveRecord(NamedTuple):
+    move: Move
+    piece: Piece
+    num_movements: int
+    captured_piece: Piece | None
+    captured_position: str | None
+    rock: Piece | None
+    rock_num_movements: int
+    promoted_piece: Piece | None
+    en_passant_position: Position | None
+    en_passant_hash: int
+    castling_rights: int
+    side_to_move: ChessColor
+    zobrist_key: int
 
 
 class Board:
     def __init__(self) -> None:
         self.pieces: list[Piece] = list()
         self.position_map: dict[str, Piece] = dict()
+        # Indexes of the pieces, updated in O(1) as pieces are added or removed.
+        # The dicts are used as ordered sets
+        self._piece_indexes: dict[Piece, int] = dict()
+        self.pieces_by_color: dict[ChessColor, dict[Piece, None]] = {
+            c: dict() for c in ChessColor
+        }
+        self.pieces_by_type: dict[tuple[ChessColor, type[Piece]], dict[Piece, None]] = {
+            (c, t): dict() for c in ChessColor for t in PIECE_CLASSES
+        }
         self.captured_pieces = {color: list() for color in ChessColor}
+        # Occupancy bitboards, kept in sync with position_map
+        self.color_bitboards: dict[ChessColor, int] = {c: 0 for c in ChessColor}
+        self.type_bitboards: dict[type[Piece], int] = {c: 0 for c in PIECE_CLASSES}
+        # Piece at each square index
+        self.squares: list[Piece | None] = [None] * 64
+        # Attack maps. The attacks of each piece are kept and the number of
+        # attackers of each square is stored in binary, one bitboard per bit
+        self.piece_attacks: dict[Piece, int] = dict()
+        self.attack_count_bitboards: dict[ChessColor, list[int]] = {
+            c: [0] * ATTACK_COUNT_BITS for c in ChessColor
+        }
+        self.kings_position: dict[ChessColor, str] = dict()
+        # Undo stack of the moves applied with make_move
+        self.history: list[MoveRecord] = list()
+        self.side_to_move: ChessColor = ChessColor.WHITE
+        # Square passed over by a pawn that just moved two squares
+        self.en_passant_position: Position | None = None
+        self.castling_rights: int = 0
+        # Zobrist hash of the position, updated incrementally as pieces move
+        self.zobrist_key: int = 0
+        self._en_passant_hash: int = 0
+        # Material and piece-square scores for white, in the midgame and in
+        # the endgame, and the game phase, updated incrementally as pieces move
+        self.midgame_score: int = 0
+        self.endgame_score: int = 0
+        self.phase: int = 0
 
     def initialize_board(self, pieces: list[Piece] | None = None):
 
+        self.midgame_score, self.endgame_score, self.phase = 0, 0, 0
         if pieces:
             self.pieces = pieces
         else:
             self.set_initial_position_of_pieces()
 
-        for piece in self.pieces:
+        for index, piece in enumerate(self.pieces):
+            self._piece_indexes[piece] = index
+            self.pieces_by_color[piece.color][piece] = None
+            self.pieces_by_type.setdefault((piece.color, type(piece)), dict())[
+                piece
+            ] = None
             self.position_map[str(piece.current_position)] = piece
+            self._place_on_square(piece, piece.current_position.index)
+            if isinstance(piece, King):
+                self.kings_position[piece.color] = str(piece.current_position)
+
+        self.castling_rights = self.compute_castling_rights()
+        self._en_passant_hash = self._en_passant_key()
+        self.zobrist_key = self.compute_zobrist_key()
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "Board":
+        # A new board, so no state of a previous position is left behind
+        board = cls()
+        pieces, board.side_to_move, board.en_passant_position = parse_fen(fen)
+        board.initialize_board(pieces=pieces)
+        return board
+
+    def fen(self) -> str:
+        return get_fen(
+            self.squares,
+            self.side_to_move,
+            self.castling_rights,
+            self.en_passant_position,
+        )
+
+    def _place_on_square(self, piece: Piece, index: int):
+        mask = SQUARE_MASKS[index]
+        self.color_bitboards[piece.color] |= mask
+        self.type_bitboards[type(piece)] = (
+            self.type_bitboards.get(type(piece), 0) | mask
+        )
+        key = (piece.color, type(piece))
+        self.zobrist_key ^= PIECE_KEYS[key][index]
+        self.midgame_score += MIDGAME_SCORES[key][index]
+        self.endgame_score += ENDGAME_SCORES[key][index]
+        self.phase += PHASE_WEIGHTS[type(piece)]
+        self.squares[index] = piece
+
+        self._update_sliders_through(index)
+        attacks = piece.get_attacks(self.occupied)
+        self.piece_attacks[piece] = attacks
+        self._add_attacks(piece.color, attacks)
+
+    def _remove_from_square(self, piece: Piece, index: int):
+        mask = ~SQUARE_MASKS[index]
+        self.color_bitboards[piece.color] &= mask
+        self.type_bitboards[type(piece)] &= mask
+        key = (piece.color, type(piece))
+        self.zobrist_key ^= PIECE_KEYS[key][index]
+        self.midgame_score -= MIDGAME_SCORES[key][index]
+        self.endgame_score -= ENDGAME_SCORES[key][index]
+        self.phase -= PHASE_WEIGHTS[type(piece)]
+        self.squares[index] = None
+
+        self._subtract_attacks(piece.color, self.piece_attacks.pop(piece))
+        self._update_sliders_through(index)
+
+    def _add_attacks(self, color: ChessColor, attacks: int):
+        # Adds one to the count of every square of attacks, carrying bit by bit
+        counts = self.attack_count_bitboards[color]
+        for bit in range(ATTACK_COUNT_BITS):
+            if not attacks:
+                break
+            count = counts[bit]
+            counts[bit] = count ^ attacks
+            attacks &= count
+
+    def _subtract_attacks(self, color: ChessColor, attacks: int):
+        counts = self.attack_count_bitboards[color]
+        for bit in range(ATTACK_COUNT_BITS):
+            if not attacks:
+                break
+            count = counts[bit]
+            counts[bit] = count ^ attacks
+            attacks &= ~count
+
+    def _update_sliders_through(self, index: int):
+        # The occupancy of the square changed, so the sliding pieces that
+        # see it now attack more or fewer squares beyond it
+        occupied = self.occupied
+        bitboards = self.type_bitboards
+        queens = bitboards[Queen]
+        sliders = bishop_attacks(index, occupied) & (bitboards[Bishop] | queens)
+        sliders |= rock_attacks(index, occupied) & (bitboards[Rock] | queens)
+        while sliders:
+            lowest_bit = sliders & -sliders
+            sliders ^= lowest_bit
+            slider = self.squares[lowest_bit.bit_length() - 1]
+            old_attacks = self.piece_attacks[slider]
+            new_attacks = slider.get_attacks(occupied)
+            if new_attacks != old_attacks:
+                self.piece_attacks[slider] = new_attacks
+                self._subtract_attacks(slider.color, old_attacks & ~new_attacks)
+                self._add_attacks(slider.color, new_attacks & ~old_attacks)
+
+    def get_attacked_squares(self, color: ChessColor) -> int:
+        # Bitboard of the squares attacked by at least one piece of color
+        attacked = 0
+        for count in self.attack_count_bitboards[color]:
+            attacked |= count
+        return attacked
+
+    def count_attackers(self, index: int, color: ChessColor) -> int:
+        return sum(
+            ((count >> index) & 1) << bit
+            for bit, count in enumerate(self.attack_count_bitboards[color])
+        )
+
+    def compute_castling_rights(self) -> int:
+        rights = 0
+        for bit, king_position, rock_position, color in CASTLING_RIGHTS:
+            king = self.position_map.get(king_position, None)
+            rock = self.position_map.get(rock_position, None)
+            if (
+                isinstance(king, King)
+                and isinstance(rock, Rock)
+                and king.color == color
+                and rock.color == color
+                and king.num_movements == 0
+                and rock.num_movements == 0
+            ):
+                rights |= bit
+        return rights
+
+    def _update_castling_rights(self):
+        rights = self.compute_castling_rights()
+        if rights != self.castling_rights:
+            self.zobrist_key ^= CASTLING_KEYS[self.castling_rights]
+            self.zobrist_key ^= CASTLING_KEYS[rights]
+            self.castling_rights = rights
+
+    def _en_passant_key(self) -> int:
+        # The en passant column only counts when a pawn can take en passant
+        position = self.en_passant_position
+        if position is None:
+            return 0
+        capturing_pawns = self.get_bitboard(self.side_to_move, Pawn)
+        if not PAWN_ATTACKS[opponent_color[self.side_to_move]][position.index] & (
+            capturing_pawns
+        ):
+            return 0
+        return EN_PASSANT_KEYS[position.coordinates[0] - 1]
+
+    def _finish_move(self, piece: Piece, origin: Position):
+        # Passes the turn to the opponent of the piece that moved, which is
+        # not always the side to move as moves can be played in any order,
+        # and records the en passant square of the next move
+        self.zobrist_key ^= self._en_passant_hash
+        self.en_passant_position = None
+        destination = piece.current_position
+        i, j = origin.coordinates
+        if isinstance(piece, Pawn) and abs(destination.coordinates[1] - j) == 2:
+            self.en_passant_position = coordinates_2_position(
+                (i, (j + destination.coordinates[1]) // 2)
+            )
+        if self.side_to_move == piece.color:
+            self.zobrist_key ^= SIDE_KEY
+        self.side_to_move = opponent_color[piece.color]
+        self._en_passant_hash = self._en_passant_key()
+        self.zobrist_key ^= self._en_passant_hash
+
+    def compute_zobrist_key(self) -> int:
+        key = CASTLING_KEYS[self.castling_rights] ^ self._en_passant_key()
+        if self.side_to_move == ChessColor.BLACK:
+            key ^= SIDE_KEY
+        for piece in self.pieces:
+            key ^= PIECE_KEYS[(piece.color, type(piece))][piece.current_position.index]
+        return key
+
+    def compute_piece_square_scores(self) -> tuple[int, int, int]:
+        midgame_score, endgame_score, phase = 0, 0, 0
+        for piece in self.pieces:
+            key = (piece.color, type(piece))
+            index = piece.current_position.index
+            midgame_score += MIDGAME_SCORES[key][index]
+            endgame_score += ENDGAME_SCORES[key][index]
+            phase += PHASE_WEIGHTS[type(piece)]
+        return midgame_score, endgame_score, phase
+
+    def _add_piece(self, piece: Piece):
+        self._piece_indexes[piece] = len(self.pieces)
+        self.pieces.append(piece)
+        self.pieces_by_color[piece.color][piece] = None
+        self.pieces_by_type.setdefault((piece.color, type(piece)), dict())[piece] = None
+
+    def _discard_piece(self, piece: Piece):
+        # The last piece of the list takes the place of the removed one
+        index = self._piece_indexes.pop(piece)
+        last_piece = self.pieces.pop()
+        if last_piece is not piece:
+            self.pieces[index] = last_piece
+            self._piece_indexes[last_piece] = index
+        del self.pieces_by_color[piece.color][piece]
+        del self.pieces_by_type[(piece.color, type(piece))][piece]
+
+    def get_pieces(
+        self, color: ChessColor, piece_class: type[Piece] | None = None
+    ) -> list[Piece]:
+        if piece_class is None:
+            return list(self.pieces_by_color[color])
+        return list(self.pieces_by_type.get((color, piece_class), ()))
+
+    @property
+    def occupied(self) -> int:
+        return (
+            self.color_bitboards[ChessColor.WHITE]
+            | self.color_bitboards[ChessColor.BLACK]
+        )
+
+    def get_bitboard(self, color: ChessColor, piece_class: type[Piece]) -> int:
+        return self.color_bitboards[color] & self.type_bitboards.get(piece_class, 0)
+
+    def is_in_check(self, color: ChessColor) -> bool:
+        king = self.color_bitboards[color] & self.type_bitboards[King]
+        return bool(self.get_attacked_squares(opponent_color[color]) & king)
+
+    def get_checkers(self, color: ChessColor) -> int:
+        # Bitboard of the pieces giving check to the king of color
+        if not self.is_in_check(color):
+            return 0
+        king = self.color_bitboards[color] & self.type_bitboards[King]
+        return self.get_attackers(king.bit_length() - 1, opponent_color[color])
+
+    def get_attackers(
+        self, index: int, color: ChessColor, occupied: int | None = None
+    ) -> int:
+        # Bitboard of the pieces of color that attack the square at index,
+        # optionally with other occupied squares than the current ones
+        if occupied is None:
+            occupied = self.occupied
+        bitboards = self.type_bitboards
+        queens = bitboards[Queen]
+        attackers = (
+            PAWN_ATTACKS[opponent_color[color]][index] & bitboards[Pawn]
+            | KNIGHT_ATTACKS[index] & bitboards[Knight]
+            | KING_ATTACKS[index] & bitboards[King]
+            | bishop_attacks(index, occupied) & (bitboards[Bishop] | queens)
+            | rock_attacks(index, occupied) & (bitboards[Rock] | queens)
+        )
+        return attackers & self.color_bitboards[color]
 
     def set_initial_position_of_pieces(self):
         self.pieces = list()
@@ -139,9 +478,18 @@ class Board:
 
         old_piece_at_location = self.position_map.get(new_position, None)
         piece = self.position_map[piece_position]
-        piece.move(name_2_position(new_position))
+        destination = name_2_position(new_position)
+        if old_piece_at_location is not None:
+            self._remove_from_square(old_piece_at_location, destination.index)
+        self._remove_from_square(piece, piece.current_position.index)
+        piece.move(destination)
+        self._place_on_square(piece, destination.index)
         self.position_map[new_position] = piece
         del self.position_map[piece_position]
+        if isinstance(piece, King):
+            self.kings_position[piece.color] = new_position
+        if isinstance(piece, (King, Rock)) or isinstance(old_piece_at_location, Rock):
+            self._update_castling_rights()
 
         return piece, old_piece_at_location
 
@@ -226,7 +574,7 @@ class Board:
         piece, captured_piece = self.move_piece_to_new_position(
             position, position_to_capture
         )
-        self.pieces.remove(captured_piece)
+        self._discard_piece(captured_piece)
         self.captured_pieces[captured_piece.color].append(captured_piece)
 
         return piece, captured_piece
@@ -237,8 +585,11 @@ class Board:
             color=original_piece.color, current_position=original_piece.current_position
         )
         self.position_map[position_of_piece] = promoted_piece
-        self.pieces.remove(original_piece)
-        self.pieces.append(promoted_piece)
+        index = original_piece.current_position.index
+        self._remove_from_square(original_piece, index)
+        self._place_on_square(promoted_piece, index)
+        self._discard_piece(original_piece)
+        self._add_piece(promoted_piece)
 
     def move(
         self,
@@ -248,6 +599,7 @@ class Board:
     ):
 
         piece_at_destination = self.position_map.get(destination_position, None)
+        origin = self.position_map[original_position].current_position
         if piece_at_destination is not None:
             piece, captured_piece = self.capture_piece(
                 original_position, destination_position
@@ -260,8 +612,116 @@ class Board:
         if self.can_promote(piece):
             self.promote_piece(destination_position, class_to_promote=promotion_class)
 
+        self._finish_move(piece, origin)
         return piece, captured_piece
 
+    def make_move(self, move: Move):
+        # Like move, but also plays the rock of a castling and takes the pawn
+        # captured en passant. Everything needed to take the move back
+        # is kept in the history for unmake_move
+        origin = str(move.origin)
+        destination = str(move.destination)
+        piece = self.position_map[origin]
+        num_movements = piece.num_movements
+        captured_position = None
+        en_passant_position = self.en_passant_position
+        en_passant_hash = self._en_passant_hash
+        castling_rights = self.castling_rights
+        side_to_move = self.side_to_move
+        zobrist_key = self.zobrist_key
+
+        if destination in self.position_map:
+            _, captured_piece = self.capture_piece(origin, destination)
+            captured_position = destination
+        else:
+            self.move_piece_to_new_position(origin, destination)
+            captured_piece = None
+            if move.en_passant:
+                captured_position = str(
+                    coordinates_2_position(
+                        (move.destination.coordinates[0], move.origin.coordinates[1])
+                    )
+                )
+                captured_piece = self._remove_piece(captured_position)
+
+        rock, rock_num_movements = None, 0
+        if move.castling:
+            rock_origin, rock_destination = CASTLING_ROCK_MOVES[destination]
+            rock = self.position_map[rock_origin]
+            rock_num_movements = rock.num_movements
+            self.move_piece_to_new_position(rock_origin, rock_destination)
+
+        promoted_piece = None
+        if self.can_promote(piece):
+            self.promote_piece(destination, move.promotion_class or Queen)
+            promoted_piece = self.position_map[destination]
+
+        self._finish_move(piece, move.origin)
+        self.history.append(
+            MoveRecord(
+                move,
+                piece,
+                num_movements,
+                captured_piece,
+                captured_position,
+                rock,
+                rock_num_movements,
+                promoted_piece,
+                en_passant_position,
+                en_passant_hash,
+                castling_rights,
+                side_to_move,
+                zobrist_key,
+            )
+        )
+
+        return piece, captured_piece
+
+    def unmake_move(self):
+        record = self.history.pop()
+        origin = str(record.move.origin)
+        destination = str(record.move.destination)
+
+        if record.promoted_piece is not None:
+            self._remove_from_square(
+                record.promoted_piece, record.move.destination.index
+            )
+            self._discard_piece(record.promoted_piece)
+            self._add_piece(record.piece)
+            self.position_map[destination] = record.piece
+            self._place_on_square(record.piece, record.move.destination.index)
+
+        if record.rock is not None:
+            rock_origin, rock_destination = CASTLING_ROCK_MOVES[destination]
+            self.move_piece_to_new_position(rock_destination, rock_origin)
+            record.rock.num_movements = record.rock_num_movements
+
+        self.move_piece_to_new_position(destination, origin)
+        record.piece.num_movements = record.num_movements
+
+        if record.captured_piece is not None:
+            self._restore_piece(record.captured_piece, record.captured_position)
+
+        self.side_to_move = record.side_to_move
+        self.en_passant_position = record.en_passant_position
+        self._en_passant_hash = record.en_passant_hash
+        self.castling_rights = record.castling_rights
+        self.zobrist_key = record.zobrist_key
+        return record.move
+
+    def _remove_piece(self, position: str) -> Piece:
+        piece = self.position_map.pop(position)
+        self._remove_from_square(piece, piece.current_position.index)
+        self._discard_piece(piece)
+        self.captured_pieces[piece.color].append(piece)
+        return piece
+
+    def _restore_piece(self, piece: Piece, position: str):
+        self.captured_pieces[piece.color].pop()
+        self._add_piece(piece)
+        self.position_map[position] = piece
+        self._place_on_square(piece, piece.current_position.index)
+
     def can_promote(self, piece: Piece):
         if not isinstance(piece, Pawn):
             return False
@@ -270,7 +730,7 @@ class Board:
 
     def copy(self):
         board_copy = Board()
+        board_copy.side_to_move = self.side_to_move
+        board_copy.en_passant_position = self.en_passant_position
         board_copy.initialize_board(pieces=deepcopy(self.pieces))
         return board_copy
-
-
@@ -0,0 +1,122 @@
+import mmap
+import struct
+from random import Random
+from typing import Iterable
+
+from chess.board import Board
+from chess.models import ChessException, Move
+from chess.move_generator import PROMOTION_CLASSES, generate_legal_moves
+
+# An entry is the zobrist key of a position, a move and its weight. Entries
+# are sorted by key, so the moves of a position are found by binary search
+BOOK_ENTRY = struct.Struct("<QHH")
+_KEY = struct.Struct("<Q")
+MAX_WEIGHT = 0xFFFF
+DEFAULT_BOOK_PLY = 20
+
+
+def encode_book_move(move: Move) -> int:
+    # Bits 0-5 origin, 6-11 destination and 12-14 promotion, 0 when the move
+    # is not one, else 1 + index in PROMOTION_CLASSES. En passant and
+    # castling are found again from the legal moves
+    promotion = 0
+    if move.promotion_class is not None:
+        promotion = PROMOTION_CLASSES.index(move.promotion_class) + 1
+    return move.origin.index | move.destination.index << 6 | promotion << 12
+
+
+def write_book(path: str, lines: Iterable[str], max_ply: int = DEFAULT_BOOK_PLY):
+    """
+    Writes the book of the games in lines, one game per line in UCI
+    notation from the initial position. The weight of a move is the number
+    of games that played it in the position, up to max_ply plies.
+    """
+    weights: dict[tuple[int, int], int] = dict()
+    for line in lines:
+        board = Board()
+        board.initialize_board()
+        for notation in line.split()[:max_ply]:
+            move = next(
+                (m for m in generate_legal_moves(board) if repr(m) == notation), None
+            )
+            if move is None:
+                raise ChessException(f"Invalid move {notation} in line {line!r}")
+            entry = (board.zobrist_key, encode_book_move(move))
+            weights[entry] = min(weights.get(entry, 0) + 1, MAX_WEIGHT)
+            board.make_move(move)
+
+    entries = sorted(weights.items(), key=lambda e: (e[0][0], -e[1]))
+    with open(path, "wb") as file:
+        for (key, code), weight in entries:
+            file.write(BOOK_ENTRY.pack(key, code, weight))
+
+
+class OpeningBook:
+    """
+    Opening book file, mapped in memory read only. Nothing is loaded when
+    the book is opened, and the pages read are shared by every process
+    that opens the same file.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            size = file.seek(0, 2)
+            if size % BOOK_ENTRY.size:
+                raise ChessException(f"Invalid opening book {path}")
+            # An empty file can not be mapped
+            self._mmap = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+            )
+        self._num_entries = size // BOOK_ENTRY.size
+
+    def __len__(self) -> int:
+        return self._num_entries
+
+    def _first_entry(self, key: int) -> int:
+        # Index of the first entry with a key not lower than key
+        low, high = 0, self._num_entries
+        while low < high:
+            middle = (low + high) // 2
+            if _KEY.unpack_from(self._mmap, middle * BOOK_ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def probe(self, key: int) -> list[tuple[int, int]]:
+        # Encoded moves and weights stored for the position with key
+        entries = list()
+        for index in range(self._first_entry(key), self._num_entries):
+            entry_key, code, weight = BOOK_ENTRY.unpack_from(
+                self._mmap, index * BOOK_ENTRY.size
+            )
+            if entry_key != key:
+                break
+            entries.append((code, weight))
+        return entries
+
+    def get_moves(self, board: Board) -> list[tuple[Move, int]]:
+        # Legal book moves of the position and their weights, heaviest first
+        entries = self.probe(board.zobrist_key)
+        if not entries:
+            return list()
+        legal_moves = {encode_book_move(m): m for m in generate_legal_moves(board)}
+        return [
+            (legal_moves[code], weight)
+            for code, weight in entries
+            if code in legal_moves
+        ]
+
+    def choose_move(self, board: Board, random: Random | None = None) -> Move | None:
+        # A book move picked at random with the odds of its weight
+        moves = self.get_moves(board)
+        if not moves:
+            return None
+        random = random or Random()
+        return random.choices(
+            [move for move, _ in moves], weights=[weight for _, weight in moves]
+        )[0]
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
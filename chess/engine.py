@@ -0,0 +1,107 @@
+import threading
+from random import Random
+
+from chess.game import Game
+from chess.models import ChessException, GameStatus, Move
+from chess.search import Search, SearchResult
+from chess.transposition import TranspositionTable
+
+DEFAULT_MOVE_TIME = 1.0
+
+
+class Engine:
+    """
+    Plays the moves of one side of a game, searching max_time seconds each
+    unless the opening book of the game has moves for the position.
+
+    After each of its moves the engine ponders: it plays the reply it
+    expects, the second move of its principal variation, on a copy of the
+    game and searches the position in a background thread while the
+    opponent thinks. When the opponent plays the expected reply, the
+    pondering search goes on for max_time more seconds and its result is
+    played. Otherwise it is stopped. Either way the transposition table it
+    filled serves the next searches.
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        max_time: float = DEFAULT_MOVE_TIME,
+        ponder: bool = True,
+        transposition_table: TranspositionTable | None = None,
+    ) -> None:
+        self.game = game
+        self.max_time = max_time
+        self.ponder = ponder
+        if transposition_table is None:
+            transposition_table = game.transposition_table or TranspositionTable()
+        self.transposition_table = transposition_table
+        self.ponder_hits = 0
+        self.random = Random()
+        self._ponder_key: int | None = None
+        self._ponder_search: Search | None = None
+        self._ponder_thread: threading.Thread | None = None
+        self._ponder_result: SearchResult | None = None
+
+    @property
+    def is_pondering(self) -> bool:
+        return self._ponder_thread is not None
+
+    def think(self) -> SearchResult:
+        # Best move of the current position of the game
+        book = self.game.opening_book
+        book_move = None
+        if book is not None:
+            book_move = book.choose_move(self.game.board, self.random)
+        if book_move is not None:
+            self.stop_pondering()
+            return SearchResult(book_move, 0, 0, 0, 0.0, [book_move])
+
+        hit = self.is_pondering and self._ponder_key == self.game.board.zobrist_key
+        if hit:
+            self._ponder_thread.join(self.max_time)
+        result = self.stop_pondering()
+        if hit and result is not None and result.best_move is not None:
+            self.ponder_hits += 1
+            return result
+        return Search(self.game, self.transposition_table).search(
+            max_time=self.max_time
+        )
+
+    def play(self) -> SearchResult:
+        result = self.think()
+        if result.best_move is None:
+            raise ChessException("There is no legal move to play")
+        self.game.play_move(result.best_move)
+        if (
+            self.ponder
+            and len(result.principal_variation) > 1
+            and self.game.status == GameStatus.ONGOING
+        ):
+            self.start_pondering(result.principal_variation[1])
+        return result
+
+    def start_pondering(self, expected_move: Move):
+        self.stop_pondering()
+        game = Game(fen=self.game.fen(), tablebase=self.game.tablebase)
+        game.board.make_move(expected_move)
+        self._ponder_key = game.board.zobrist_key
+        self._ponder_search = Search(game, self.transposition_table)
+        self._ponder_thread = threading.Thread(target=self._ponder, daemon=True)
+        self._ponder_thread.start()
+
+    def _ponder(self):
+        self._ponder_result = self._ponder_search.search()
+
+    def stop_pondering(self) -> SearchResult | None:
+        # Result of the last completed iteration of the pondering search
+        if self._ponder_thread is None:
+            return None
+        self._ponder_search.stop()
+        self._ponder_thread.join()
+        result = self._ponder_result
+        self._ponder_key = None
+        self._ponder_search = None
+        self._ponder_thread = None
+        self._ponder_result = None
+        return result
@@ -0,0 +1,13 @@
+from chess.board import Board
+from chess.models import ChessColor
+from chess.piece_square import MAX_PHASE
+
+
+def evaluate(board: Board) -> int:
+    # Midgame and endgame scores kept by the board, tapered by the game
+    # phase, from the point of view of the side to move
+    phase = min(board.phase, MAX_PHASE)
+    score = (
+        board.midgame_score * phase + board.endgame_score * (MAX_PHASE - phase)
+    ) // MAX_PHASE
+    return score if board.side_to_move == ChessColor.WHITE else -score
@@ -0,0 +1,62 @@
+from chess.bitboard import SQUARE_MASKS
+from chess.board import Board
+from chess.models import ChessColor, Move, opponent_color
+from chess.piece_square import PIECE_VALUES
+from chess.pieces import PIECE_CLASSES, King, Pawn, Piece
+
+# A king can take part in an exchange, but can never be taken back
+EXCHANGE_VALUES: dict[type[Piece], int] = {**PIECE_VALUES, King: 20_000}
+
+
+def static_exchange_evaluation(board: Board, move: Move) -> int:
+    """
+    Material won by the side that plays move when both sides keep taking
+    back on the destination square, each time with its least valuable
+    attacker and each free to stop when going on would lose material.
+    Sliders behind the pieces that took part are found as the occupancy
+    shrinks. Pins are not considered.
+    """
+    origin = move.origin.index
+    destination = move.destination.index
+    piece = board.squares[origin]
+    victim = board.squares[destination]
+
+    occupied = board.occupied & ~SQUARE_MASKS[origin]
+    if move.en_passant:
+        step = 8 if piece.color == ChessColor.WHITE else -8
+        occupied &= ~SQUARE_MASKS[destination - step]
+        gains = [EXCHANGE_VALUES[Pawn]]
+    else:
+        gains = [EXCHANGE_VALUES[type(victim)] if victim is not None else 0]
+
+    attacker_value = EXCHANGE_VALUES[type(piece)]
+    if move.promotion_class is not None:
+        promotion_value = EXCHANGE_VALUES[move.promotion_class]
+        gains[0] += promotion_value - EXCHANGE_VALUES[Pawn]
+        attacker_value = promotion_value
+
+    color = opponent_color[piece.color]
+    type_bitboards = board.type_bitboards
+    while True:
+        attackers = board.get_attackers(destination, color, occupied) & occupied
+        if not attackers:
+            break
+        for piece_class in PIECE_CLASSES:
+            least_valuable = attackers & type_bitboards[piece_class]
+            if least_valuable:
+                break
+
+        # Taking back wins the piece that just moved to the square
+        gains.append(attacker_value - gains[-1])
+        if max(-gains[-2], gains[-1]) < 0:
+            # The side to take back is already better off stopping
+            gains.pop()
+            break
+        attacker_value = EXCHANGE_VALUES[piece_class]
+        occupied &= ~(least_valuable & -least_valuable)
+        color = opponent_color[color]
+
+    # Each side may stop the exchange instead of taking back
+    for i in range(len(gains) - 1, 0, -1):
+        gains[i - 1] = -max(-gains[i - 1], gains[i])
+    return gains[0]
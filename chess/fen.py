@@ -0,0 +1,122 @@
+from typing import NamedTuple
+
+from chess.models import (
+    PIECE_LETTERS,
+    POSITIONS,
+    ChessColor,
+    ChessException,
+    Position,
+    name_2_position,
+)
+from chess.pieces import PIECE_CLASSES, King, Pawn, Piece, Rock
+
+INITIAL_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+FEN_PIECE_CLASSES = {PIECE_LETTERS[c.__name__]: c for c in PIECE_CLASSES}
+FEN_COLORS = {"w": ChessColor.WHITE, "b": ChessColor.BLACK}
+
+# Castling letter, right bit, king position and rock position
+FEN_CASTLINGS = [
+    ("K", 1, "e1", "h1"),
+    ("Q", 2, "e1", "a1"),
+    ("k", 4, "e8", "h8"),
+    ("q", 8, "e8", "a8"),
+]
+
+
+class FenPosition(NamedTuple):
+    pieces: list[Piece]
+    side_to_move: ChessColor
+    en_passant_position: Position | None
+
+
+def parse_fen(fen: str) -> FenPosition:
+    # Move counters are accepted but not kept, the board does not track them
+    fields = fen.split()
+    if len(fields) < 4:
+        raise ChessException(f"Invalid FEN {fen}")
+    placement, side, castling, en_passant = fields[:4]
+
+    rows = placement.split("/")
+    if len(rows) != 8 or side not in FEN_COLORS:
+        raise ChessException(f"Invalid FEN {fen}")
+
+    pieces = list()
+    pieces_by_position: dict[str, Piece] = dict()
+    for r, row in enumerate(rows):
+        y = 8 - r
+        x = 1
+        for char in row:
+            if char.isdigit():
+                x += int(char)
+                continue
+            piece_class = FEN_PIECE_CLASSES.get(char.lower(), None)
+            if piece_class is None or x > 8:
+                raise ChessException(f"Invalid FEN {fen}")
+            color = ChessColor.WHITE if char.isupper() else ChessColor.BLACK
+            piece = piece_class(
+                color=color, current_position=POSITIONS[x - 1 + 8 * (y - 1)]
+            )
+            pieces.append(piece)
+            pieces_by_position[str(piece.current_position)] = piece
+            x += 1
+        if x != 9:
+            raise ChessException(f"Invalid FEN {fen}")
+
+    # Castling rights are derived from the moves of kings and rocks, so the
+    # pieces that lost their rights are marked as already moved
+    for letter, _, _, rock_position in FEN_CASTLINGS:
+        if letter in castling:
+            continue
+        rock = pieces_by_position.get(rock_position, None)
+        if isinstance(rock, Rock):
+            rock.num_movements = 1
+    for color, letters in ((ChessColor.WHITE, "KQ"), (ChessColor.BLACK, "kq")):
+        king_position = "e1" if color == ChessColor.WHITE else "e8"
+        king = pieces_by_position.get(king_position, None)
+        if isinstance(king, King) and not any(c in castling for c in letters):
+            king.num_movements = 1
+
+    for piece in pieces:
+        if isinstance(piece, Pawn) and piece.current_position.coordinates[1] != (
+            2 if piece.color == ChessColor.WHITE else 7
+        ):
+            piece.num_movements = 1
+
+    en_passant_position = None
+    if en_passant != "-":
+        en_passant_position = name_2_position(en_passant)
+
+    return FenPosition(pieces, FEN_COLORS[side], en_passant_position)
+
+
+def get_fen(
+    squares: list[Piece | None],
+    side_to_move: ChessColor,
+    castling_rights: int,
+    en_passant_position: Position | None,
+) -> str:
+    rows = list()
+    for y in range(8, 0, -1):
+        row = ""
+        empty = 0
+        for x in range(1, 9):
+            piece = squares[x - 1 + 8 * (y - 1)]
+            if piece is None:
+                empty += 1
+                continue
+            if empty:
+                row += str(empty)
+                empty = 0
+            letter = PIECE_LETTERS[type(piece).__name__]
+            row += letter.upper() if piece.color == ChessColor.WHITE else letter
+        if empty:
+            row += str(empty)
+        rows.append(row)
+
+    side = "w" if side_to_move == ChessColor.WHITE else "b"
+    castling = "".join(
+        letter for letter, bit, _, _ in FEN_CASTLINGS if castling_rights & bit
+    )
+    en_passant = "-" if en_passant_position is None else str(en_passant_position)
+    return f"{'/'.join(rows)} {side} {castling or '-'} {en_passant} 0 1"
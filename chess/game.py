@@ -1,31 +1,72 @@
-from chess.board import Board
+from typing import Iterator
+
+from chess.board import CASTLING_ROCK_MOVES, Board
+from chess.book import OpeningBook
+from chess.bitboard import BETWEEN_MASKS, SQUARE_MASKS, are_aligned, iter_indexes
 from chess.models import (
+    RAYS,
     ChessColor,
     ChessException,
+    Direction,
+    GameStatus,
+    Move,
     coordinates_2_position,
     name_2_position,
+    opponent_color,
+)
+from chess.move_generator import (
+    MoveLegality,
+    check_move,
+    count_legal_moves,
+    generate_legal_moves,
+    get_game_status,
+    get_pawn_targets,
+    perft,
+    perft_divide,
+)
+from chess.pieces import Knight, Pawn, Piece, Queen
+from chess.tablebase import Outcome, Tablebase, TablebaseResult
+from chess.transposition import (
+    COLOR_INDEX,
+    TranspositionTable,
+    decode_moves,
+    encode_moves,
 )
-from chess.pieces import King, Knight, Piece, Queen
 from chess.utils import sign_or_null
 
-opponent_color = {
-    ChessColor.WHITE: ChessColor.BLACK,
-    ChessColor.BLACK: ChessColor.WHITE,
-}
-
 
 class Game:
-    def __init__(self, pieces: list[Piece] | None = None) -> None:
-        self.board = Board()
-        self.board.initialize_board(pieces=pieces)
-        self.kings_position: dict[ChessColor, str] = dict()
-        self.threatening_pieces: dict[ChessColor, list[Piece]] = {
-            c: [] for c in ChessColor
+    def __init__(
+        self,
+        pieces: list[Piece] | None = None,
+        transposition_table: TranspositionTable | None = None,
+        fen: str | None = None,
+        opening_book: OpeningBook | None = None,
+        tablebase: Tablebase | None = None,
+    ) -> None:
+        # Optional cache of check and mate results, may be shared between games
+        self.transposition_table = transposition_table
+        # Optional book asked for moves before searching, see book_moves
+        self.opening_book = opening_book
+        # Optional endgame tables, see probe_tablebase
+        self.tablebase = tablebase
+        if fen is not None:
+            self.board = Board.from_fen(fen)
+        else:
+            self.board = Board()
+            self.board.initialize_board(pieces=pieces)
+        # Shared with the board, which keeps it updated as pieces move
+        self.kings_position: dict[ChessColor, str] = self.board.kings_position
+        # Pieces giving check found by the last check verification of each
+        # color, with the key of the position they were found in, see
+        # threatening_pieces
+        self.checkers: dict[ChessColor, int] = {c: 0 for c in ChessColor}
+        self.checkers_keys: dict[ChessColor, int] = {
+            c: self.board.zobrist_key for c in ChessColor
         }
 
-        for piece in self.board.pieces:
-            if isinstance(piece, King):
-                self.kings_position[piece.color] = str(piece.current_position)
+        # Result of the last move, see make_move
+        self.status = GameStatus.ONGOING
 
         if len(self.kings_position) < 2:
             raise ChessException("One must have two kings at the board")
@@ -36,33 +77,26 @@ class Game:
         if origin == destination:
             return True
 
-        destination_position = name_2_position(destination)
-
-        for next_position in self.get_straight_path_from_origin_to_destination(
-            origin, destination
-        ):
-            if next_position == destination_position:
-                return True
-            piece = self.board.position_map.get(str(next_position), None)
-            if piece is not None:
-                return False
+        origin_index = name_2_position(origin).index
+        destination_index = name_2_position(destination).index
+        if not are_aligned(origin_index, destination_index):
+            return False
+        between = BETWEEN_MASKS[origin_index][destination_index]
+        return not between & self.board.occupied
 
     def get_straight_path_from_origin_to_destination(
         self, origin: str, destination: str
     ):
+        # Squares from origin towards destination, up to the edge of the board
         origin_position = name_2_position(origin)
         destination_position = name_2_position(destination)
         a, b = origin_position.coordinates
         c, d = destination_position.coordinates
         x, y = (c - a, d - b)
-        vector = (sign_or_null(x), sign_or_null(y))
-
-        while True:
-            next_position = coordinates_2_position((a + vector[0], b + vector[1]))
-            if next_position is None:
-                break
-            yield next_position
-            a, b = next_position.coordinates
+        if x == 0 and y == 0:
+            return iter(())
+        direction = Direction((sign_or_null(x), sign_or_null(y)))
+        return iter(RAYS[direction][origin_position.index])
 
     def verify_if_piece_can_move_to_location(
         self, position: str, destination: str
@@ -72,91 +106,159 @@ class Game:
         if piece is None:
             raise ChessException(f"There is not a piece at location {position}")
 
+        if isinstance(piece, Knight):
+            # Knight can jump over other pieces and its table already
+            # leaves out the squares of pieces of the same color
+            moves = piece.get_moves(self.board.color_bitboards[piece.color])
+            return bool(moves & SQUARE_MASKS[destination_position.index])
+
         other_piece = self.board.position_map.get(destination, None)
         if other_piece is not None and other_piece.color == piece.color:
             # Cannot move to location of piece of same color
             return False
 
-        if destination_position not in list(piece.get_possible_positions_to_move()):
-            return False
-        if not isinstance(piece, Knight):
-            return self.verify_if_path_is_not_blocked_by_another_piece(
-                position, destination
+        if isinstance(piece, Pawn):
+            # Pawns push to empty squares and capture diagonally
+            targets = get_pawn_targets(
+                self.board, piece.color, piece.current_position.index
             )
-        else:
-            # Knight can jump over other pieces
-            return True
+            return bool(targets & SQUARE_MASKS[destination_position.index])
+
+        # Sliding attacks stop at the first occupied square and knights jump
+        attacks = piece.get_attacks(self.board.occupied)
+        return bool(attacks & SQUARE_MASKS[destination_position.index])
+
+    @property
+    def threatening_pieces(self) -> dict[ChessColor, list[Piece]]:
+        # Built from the checkers bitboards only when asked for. Checkers
+        # found before the last move may no longer be on their squares and
+        # are left out
+        squares = self.board.squares
+        key = self.board.zobrist_key
+        return {
+            color: (
+                [squares[i] for i in iter_indexes(checkers)]
+                if self.checkers_keys[color] == key
+                else []
+            )
+            for color, checkers in self.checkers.items()
+        }
 
     def verify_if_king_is_in_check(
         self, king_color: ChessColor, board: Board | None = None
     ):
         if board is not None:
-            aux_game = Game(pieces=board.pieces)
-            return aux_game.verify_if_king_is_in_check(king_color=king_color)
-
-        king_position = self.kings_position[king_color]
-        threatening_pieces = list()
-        for piece in self.board.pieces:
-            if piece.color == king_color:
-                continue
-            if self.verify_if_piece_can_move_to_location(
-                position=str(piece.current_position), destination=king_position
-            ):
-                threatening_pieces.append(piece)
+            # Answered by the attack maps of the board, no game is built
+            return board.is_in_check(king_color)
 
-        self.threatening_pieces[king_color] = threatening_pieces
-        return len(threatening_pieces) > 0
+        entry = None
+        color_index = COLOR_INDEX[king_color]
+        if self.transposition_table is not None:
+            entry = self.transposition_table.get_entry(self.board.zobrist_key)
+            if entry.checkers[color_index] is not None:
+                self.transposition_table.record_hit()
+                self.checkers[king_color] = entry.checkers[color_index]
+                self.checkers_keys[king_color] = self.board.zobrist_key
+                return entry.checkers[color_index] != 0
+            self.transposition_table.record_miss()
+
+        checkers = self.board.get_checkers(king_color)
+        if entry is not None:
+            entry.checkers[color_index] = checkers
+        self.checkers[king_color] = checkers
+        self.checkers_keys[king_color] = self.board.zobrist_key
+        return checkers != 0
+
+    def is_square_attacked(self, position: str, by_color: ChessColor) -> bool:
+        index = name_2_position(position).index
+        return bool(self.board.get_attacked_squares(by_color) & SQUARE_MASKS[index])
+
+    def count_attackers(self, position: str, by_color: ChessColor) -> int:
+        return self.board.count_attackers(name_2_position(position).index, by_color)
+
+    def get_status(self, color: ChessColor | None = None) -> GameStatus:
+        # Ongoing, checkmate or stalemate when it is the turn of color
+        if color is None:
+            color = self.board.side_to_move
+        if self.transposition_table is None:
+            return get_game_status(self.board, color)
+
+        color_index = COLOR_INDEX[color]
+        entry = self.transposition_table.get_entry(self.board.zobrist_key)
+        if entry.status[color_index] is not None:
+            self.transposition_table.record_hit()
+            return entry.status[color_index]
+
+        self.transposition_table.record_miss()
+        if entry.legal_moves is not None and color == self.board.side_to_move:
+            # Known legal moves answer without looking for one
+            if entry.legal_moves:
+                status = GameStatus.ONGOING
+            elif self.board.is_in_check(color):
+                status = GameStatus.CHECKMATE
+            else:
+                status = GameStatus.STALEMATE
+        else:
+            status = get_game_status(self.board, color)
+        entry.status[color_index] = status
+        return status
+
+    def probe_tablebase(self) -> TablebaseResult | None:
+        # Result of the current position with perfect play, when the
+        # tablebase has a table for it
+        if self.tablebase is None:
+            return None
+        return self.tablebase.probe(self.board)
 
     def verify_check_mate(self, king_color: ChessColor):
-        king_position = self.kings_position[king_color]
-        king = self.board.position_map[king_position]
+        if king_color == self.board.side_to_move:
+            result = self.probe_tablebase()
+            if result is not None:
+                # Checkmate is a loss in 0 plies, no move is generated
+                self.verify_if_king_is_in_check(king_color=king_color)
+                return result.outcome == Outcome.LOSS and result.plies == 0
 
-        if not self.verify_if_king_is_in_check(king_color=king.color):
-            return False
+        status = self.get_status(king_color)
+        # Also updates the threatening pieces
+        self.verify_if_king_is_in_check(king_color=king_color)
+        return status == GameStatus.CHECKMATE
 
-        # Check if king can save himself by moving to safe position
-        for position in king.get_possible_positions_to_move():
-            if not self.verify_if_piece_can_move_to_location(
-                position=king_position, destination=str(position)
-            ):
-                continue
-            new_board = self.board.copy()
-            new_board.move(king_position, str(position))
-            if not self.verify_if_king_is_in_check(
-                king_color=king.color, board=new_board
-            ):
-                return False
+    def legal_moves(self, color: ChessColor | None = None) -> Iterator[Move]:
+        # Moves are yielded one at a time from the current position, so the
+        # board must not change until the iteration is over. With a
+        # transposition table the moves of the side to move are listed once
+        # and read back from the table
+        if self.transposition_table is None or color not in (
+            None,
+            self.board.side_to_move,
+        ):
+            return generate_legal_moves(self.board, color)
 
-        # Check if any piece can capture threatening piece
-        if len(self.threatening_pieces[king_color]) > 1:
-            # Impossible escape from a double check by capture more then one piece in single move
-            return True
+        entry = self.transposition_table.get_entry(self.board.zobrist_key)
+        if entry.legal_moves is not None:
+            self.transposition_table.record_hit()
+        else:
+            self.transposition_table.record_miss()
+            entry.legal_moves = encode_moves(generate_legal_moves(self.board))
+        return decode_moves(entry.legal_moves)
 
-        threatening_piece = self.threatening_pieces[king_color][0]
-        enemy_pieces = (p for p in self.board.pieces if p.color == king_color)
-        for enemy_piece in enemy_pieces:
-            try:
-                self.validate_move(
-                    origin=str(enemy_piece.current_position),
-                    destination=str(threatening_piece.current_position),
-                )
-                return False
-            except ChessException:
-                continue
-
-        # Check if any piece can block the way of threatening piece
-        enemy_pieces = (p for p in self.board.pieces if p.color == king_color)
-        for enemy_piece in enemy_pieces:
-            positions_in_path = self.get_straight_path_from_origin_to_destination(
-                str(threatening_piece.current_position), king_position
-            )
-            for pos in positions_in_path:
-                try:
-                    self.validate_move(str(enemy_piece.current_position), str(pos))
-                    return False
-                except ChessException:
-                    continue
-        return True
+    def count_legal_moves(self, color: ChessColor | None = None) -> int:
+        return count_legal_moves(self.board, color)
+
+    def book_moves(self) -> list[tuple[Move, int]]:
+        # Moves of the opening book for the current position, with weights
+        if self.opening_book is None:
+            return list()
+        return self.opening_book.get_moves(self.board)
+
+    def fen(self) -> str:
+        return self.board.fen()
+
+    def perft(self, depth: int, max_workers: int = 1) -> int:
+        return perft(self.board, depth, max_workers)
+
+    def perft_divide(self, depth: int, max_workers: int = 1) -> dict[str, int]:
+        return perft_divide(self.board, depth, max_workers)
 
     def validate_move(
         self,
@@ -167,11 +269,15 @@ class Game:
         castling: bool = False,
         rock_position: str | None = None,
     ):
+        piece = self.board.position_map.get(origin, None)
+        if piece is None:
+            raise ChessException(f"There is not a piece at location {origin}")
+
         if en_passant:
             if not self.board.check_if_en_passant_is_possible(
                 pawn_position=origin, enemy_pawn_position=enemy_pawn_position
             ):
-                raise ChessColor("En passant move is not valid")
+                raise ChessException("En passant move is not valid")
 
         if castling:
             if not self.board.check_if_castling_is_possible(
@@ -179,13 +285,18 @@ class Game:
             ):
                 raise ChessException("Castling move is not valid")
 
-        if not self.verify_if_piece_can_move_to_location(origin, destination):
+        # Pins and checks are read from the current position, the move is
+        # never played to find out if it leaves the king attacked
+        move = Move(
+            origin=piece.current_position,
+            destination=name_2_position(destination),
+            en_passant=en_passant,
+            castling=castling,
+        )
+        legality = check_move(self.board, move)
+        if legality == MoveLegality.NOT_ALLOWED:
             raise ChessException(f"This move is not allowed")
-
-        piece = self.board.position_map[origin]
-        new_board = self.board.copy()
-        new_board.move(original_position=origin, destination_position=destination)
-        if self.verify_if_king_is_in_check(king_color=piece.color, board=new_board):
+        if legality == MoveLegality.KING_IN_CHECK:
             raise ChessException(
                 f"This move would put the {piece.color.value.lower()} king in check"
             )
@@ -208,15 +319,40 @@ class Game:
             castling,
             rock_position,
         )
-        piece, _ = self.board.move(
-            original_position=origin,
-            destination_position=destination,
-            promotion_class=promotion_class,
+        piece, _ = self.board.make_move(
+            Move(
+                origin=name_2_position(origin),
+                destination=name_2_position(destination),
+                promotion_class=promotion_class,
+                en_passant=en_passant,
+                castling=castling,
+            )
         )
 
-        if isinstance(piece, King):
-            self.kings_position[piece.color] = str(piece.current_position)
-
-        self.verify_check_mate(king_color=opponent_color[piece.color])
+        self.status = self.get_status(opponent_color[piece.color])
+        self.verify_if_king_is_in_check(king_color=opponent_color[piece.color])
 
         return piece
+
+    def play_move(self, move: Move):
+        # Plays a move as given by legal_moves or by a search
+        enemy_pawn_position = None
+        if move.en_passant:
+            enemy_pawn_position = str(
+                coordinates_2_position(
+                    (move.destination.coordinates[0], move.origin.coordinates[1])
+                )
+            )
+        rock_position = None
+        if move.castling:
+            rock_position = CASTLING_ROCK_MOVES[str(move.destination)][0]
+
+        return self.make_move(
+            str(move.origin),
+            str(move.destination),
+            promotion_class=move.promotion_class or Queen,
+            en_passant=move.en_passant,
+            enemy_pawn_position=enemy_pawn_position,
+            castling=move.castling,
+            rock_position=rock_position,
+        )
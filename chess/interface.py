@@ -1,3 +1,4 @@
+from chess.engine import DEFAULT_MOVE_TIME, Engine
 from chess.game import Game
 from chess.models import ChessColor, ChessException, name_2_position
 from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rock
@@ -7,8 +8,22 @@ CHAR_INDEXES = {c: index + 1 for index, c in enumerate("abcdefgh")}
 
 
 class GameInterface:
-    def __init__(self, game: Game) -> None:
+    def __init__(
+        self,
+        game: Game,
+        engine_color: ChessColor | None = None,
+        max_time: float = DEFAULT_MOVE_TIME,
+        ponder: bool = True,
+    ) -> None:
         self.game = game
+        # The engine plays the moves of engine_color, pondering while the
+        # other player types a move
+        self.engine_color = engine_color
+        self.engine = (
+            Engine(game, max_time=max_time, ponder=ponder)
+            if engine_color is not None
+            else None
+        )
 
     def get_castling_info_from_algebraic_notation(
         self, alg_notation: str, player_color: ChessColor
@@ -151,10 +166,8 @@ class GameInterface:
         destination_position = name_2_position(destination)
         possible_pieces = [
             pc
-            for pc in self.game.board.pieces
-            if pc.color == player_color
-            and isinstance(pc, piece_class)
-            and destination_position in pc.get_possible_positions_to_move()
+            for pc in self.game.board.get_pieces(player_color, piece_class)
+            if destination_position in pc.get_possible_positions_to_move()
         ]
         if not possible_pieces:
             raise ChessException(f"No piece can move to {destination}")
@@ -271,8 +284,19 @@ class GameInterface:
             turns.append(turn)
 
             print(f"\n{turn.value.capitalize()} player turn")
+            if turn == self.engine_color:
+                try:
+                    result = self.engine.play()
+                except ChessException as error:
+                    print(error)
+                    break
+                print(f"Engine plays {result.best_move!r} ({result})")
+                continue
+
             notation = input(f"Type your move in algebraic notation: ")
             if notation == "end":
+                if self.engine is not None:
+                    self.engine.stop_pondering()
                 break
 
             try:
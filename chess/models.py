@@ -1,3 +1,5 @@
+from typing import NamedTuple
+
 from pydantic import NonNegativeInt, PositiveInt
 from pydantic.dataclasses import dataclass
 from enum import Enum
@@ -7,6 +9,16 @@ class ChessColor(Enum):
     WHITE = "white"
     BLACK = "black"
 
+    # Members are singletons, the identity hash of object is much faster than
+    # the one of Enum and colors are dict keys all over the board
+    __hash__ = object.__hash__
+
+
+opponent_color = {
+    ChessColor.WHITE: ChessColor.BLACK,
+    ChessColor.BLACK: ChessColor.WHITE,
+}
+
 
 class LetterPosition(Enum):
     A = 1
@@ -19,6 +31,17 @@ class LetterPosition(Enum):
     H = 8
 
 
+class Direction(Enum):
+    UP = (0, 1)
+    DOWN = (0, -1)
+    LEFT = (-1, 0)
+    RIGHT = (1, 0)
+    LEFT_UP = (-1, 1)
+    LEFT_DOWN = (-1, -1)
+    RIGHT_UP = (1, 1)
+    RIGHT_DOWN = (1, -1)
+
+
 class NumberPosition(Enum):
     ONE = 1
     TWO = 2
@@ -35,9 +58,14 @@ class Position:
     x: LetterPosition
     y: NumberPosition
 
+    def __post_init__(self):
+        self.index = (self.x.value - 1) + 8 * (self.y.value - 1)
+        self._coordinates = (int(self.x.value), int(self.y.value))
+        self._name = f"{self.x.name.lower()}{self.y.value}"
+
     @property
     def coordinates(self):
-        return (int(self.x.value), int(self.y.value))
+        return self._coordinates
 
     @property
     def color(self):
@@ -54,66 +82,141 @@ class Position:
                 return ChessColor.BLACK
 
     def get_up_position(self):
-        i, j = self.coordinates
-        return coordinates_2_position((i, j + 1))
+        return _UP_NEIGHBOURS[self.index]
 
     def get_down_position(self):
-        i, j = self.coordinates
-        return coordinates_2_position((i, j - 1))
+        return _DOWN_NEIGHBOURS[self.index]
 
     def get_right_position(self):
-        i, j = self.coordinates
-        return coordinates_2_position((i + 1, j))
+        return _RIGHT_NEIGHBOURS[self.index]
 
     def get_left_position(self):
-        i, j = self.coordinates
-        return coordinates_2_position((i - 1, j))
-
-    def get_left_position(self):
-        i, j = self.coordinates
-        return coordinates_2_position((i - 1, j))
+        return _LEFT_NEIGHBOURS[self.index]
 
     def get_left_up_position(self):
-        i, j = self.coordinates
-        return coordinates_2_position((i - 1, j + 1))
+        return _LEFT_UP_NEIGHBOURS[self.index]
 
     def get_left_down_position(self):
-        i, j = self.coordinates
-        return coordinates_2_position((i - 1, j - 1))
+        return _LEFT_DOWN_NEIGHBOURS[self.index]
 
     def get_right_up_position(self):
-        i, j = self.coordinates
-        return coordinates_2_position((i + 1, j + 1))
+        return _RIGHT_UP_NEIGHBOURS[self.index]
 
     def get_right_down_position(self):
-        i, j = self.coordinates
-        return coordinates_2_position((i + 1, j - 1))
+        return _RIGHT_DOWN_NEIGHBOURS[self.index]
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Position):
             return False
-        return self.coordinates == other.coordinates
+        return self.index == other.index
 
     def __repr__(self) -> str:
-        return f"{self.x.name.lower()}{self.y.value}"
+        return self._name
 
     def __hash__(self) -> NonNegativeInt:
-        return hash(str(self))
+        return self.index
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # Positions are immutable flyweights, copies of a board share them
+        return self
+
+
+# All 64 squares are built once. Index 0 is a1, 7 is h1 and 63 is h8
+POSITIONS: tuple[Position, ...] = tuple(
+    Position(x=LetterPosition(i % 8 + 1), y=NumberPosition(i // 8 + 1))
+    for i in range(64)
+)
+POSITIONS_BY_COORDINATES: dict[tuple[int, int], Position] = {
+    p.coordinates: p for p in POSITIONS
+}
+POSITIONS_BY_NAME: dict[str, Position] = {str(p): p for p in POSITIONS}
+
+
+def _build_ray(position: Position, direction: Direction) -> tuple[Position, ...]:
+    dx, dy = direction.value
+    i, j = position.coordinates
+    ray = list()
+    while (i + dx, j + dy) in POSITIONS_BY_COORDINATES:
+        i, j = i + dx, j + dy
+        ray.append(POSITIONS_BY_COORDINATES[(i, j)])
+    return tuple(ray)
+
+
+# RAYS[direction][index] are the squares seen from index walking in direction,
+# nearest first. NEIGHBOURS[direction][index] is the first of them or None
+RAYS: dict[Direction, tuple[tuple[Position, ...], ...]] = {
+    direction: tuple(_build_ray(p, direction) for p in POSITIONS)
+    for direction in Direction
+}
+NEIGHBOURS: dict[Direction, tuple[Position | None, ...]] = {
+    direction: tuple(ray[0] if ray else None for ray in rays)
+    for direction, rays in RAYS.items()
+}
+
+_UP_NEIGHBOURS = NEIGHBOURS[Direction.UP]
+_DOWN_NEIGHBOURS = NEIGHBOURS[Direction.DOWN]
+_LEFT_NEIGHBOURS = NEIGHBOURS[Direction.LEFT]
+_RIGHT_NEIGHBOURS = NEIGHBOURS[Direction.RIGHT]
+_LEFT_UP_NEIGHBOURS = NEIGHBOURS[Direction.LEFT_UP]
+_LEFT_DOWN_NEIGHBOURS = NEIGHBOURS[Direction.LEFT_DOWN]
+_RIGHT_UP_NEIGHBOURS = NEIGHBOURS[Direction.RIGHT_UP]
+_RIGHT_DOWN_NEIGHBOURS = NEIGHBOURS[Direction.RIGHT_DOWN]
 
 
 def coordinates_2_position(coordinates: tuple[int, int]) -> Position | None:
     i, j = coordinates
-    try:
-        return Position(x=LetterPosition(i), y=NumberPosition(j))
-    except ValueError:
-        return None
+    return POSITIONS_BY_COORDINATES.get((i, j), None)
+
+
+def index_2_position(index: int) -> Position:
+    return POSITIONS[index]
 
 
 def name_2_position(name: str) -> Position:
+    position = POSITIONS_BY_NAME.get(name, None)
+    if position is not None:
+        return position
+
     x = LetterPosition[name[0].upper()]
     y = NumberPosition(int(name[1]))
 
-    return Position(x, y)
+    return POSITIONS_BY_COORDINATES[(x.value, y.value)]
+
+
+class GameStatus(Enum):
+    ONGOING = "ongoing"
+    CHECKMATE = "checkmate"
+    STALEMATE = "stalemate"
+
+
+class Move(NamedTuple):
+    origin: Position
+    destination: Position
+    promotion_class: type | None = None
+    en_passant: bool = False
+    castling: bool = False
+
+    def __repr__(self) -> str:
+        if self.promotion_class is None:
+            return f"{self.origin}{self.destination}"
+        letter = PIECE_LETTERS[self.promotion_class.__name__]
+        return f"{self.origin}{self.destination}{letter}"
+
+
+# Letters of the pieces of the black side in FEN and UCI notation
+PIECE_LETTERS = {
+    "King": "k",
+    "Queen": "q",
+    "Rock": "r",
+    "Bishop": "b",
+    "Knight": "n",
+    "Pawn": "p",
+}
 
 
 PIECE_SYMBOLS = {
@@ -0,0 +1,427 @@
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from typing import NamedTuple
+
+from chess.bitboard import (
+    BETWEEN_MASKS,
+    FULL_BOARD,
+    KING_ATTACKS,
+    PAWN_ATTACKS,
+    SQUARE_MASKS,
+    bishop_attacks,
+    iter_indexes,
+    rock_attacks,
+)
+from chess.board import Board
+from chess.models import (
+    POSITIONS,
+    ChessColor,
+    GameStatus,
+    Move,
+    opponent_color,
+)
+from chess.pieces import Bishop, King, Knight, Pawn, Piece, Queen, Rock
+
+PROMOTION_CLASSES = (Queen, Rock, Bishop, Knight)
+
+# Pawn data by color: index step of a push, row of the double push, last row
+_PAWN_STEP = {ChessColor.WHITE: 8, ChessColor.BLACK: -8}
+_PAWN_INITIAL_ROW = {ChessColor.WHITE: 2, ChessColor.BLACK: 7}
+_PAWN_LAST_ROW = {ChessColor.WHITE: 8, ChessColor.BLACK: 1}
+_LAST_ROW_MASKS = {
+    color: sum(SQUARE_MASKS[(row - 1) * 8 + column] for column in range(8))
+    for color, row in _PAWN_LAST_ROW.items()
+}
+
+
+class Castling(NamedTuple):
+    right: int
+    king_origin: int
+    king_destination: int
+    # Squares between king and rock, and squares the king passes through
+    empty_squares: int
+    safe_squares: int
+
+
+def _mask(*indexes: int) -> int:
+    return sum(SQUARE_MASKS[i] for i in indexes)
+
+
+CASTLINGS = {
+    ChessColor.WHITE: (
+        Castling(1, 4, 6, _mask(5, 6), _mask(5, 6)),
+        Castling(2, 4, 2, _mask(1, 2, 3), _mask(2, 3)),
+    ),
+    ChessColor.BLACK: (
+        Castling(4, 60, 62, _mask(61, 62), _mask(61, 62)),
+        Castling(8, 60, 58, _mask(57, 58, 59), _mask(58, 59)),
+    ),
+}
+
+
+class MoveLegality(Enum):
+    LEGAL = "legal"
+    NOT_ALLOWED = "not allowed"
+    KING_IN_CHECK = "king in check"
+
+
+class MoveRestrictions(NamedTuple):
+    king_index: int
+    # Enemy pieces giving check
+    checkers: int
+    # Squares where a move of a piece other than the king ends the check
+    check_mask: int
+    # Line along which each pinned piece can still move, by its index
+    pins: dict[int, int]
+
+
+def get_king_index(board: Board, color: ChessColor) -> int:
+    return (board.color_bitboards[color] & board.type_bitboards[King]).bit_length() - 1
+
+
+def get_move_restrictions(board: Board, color: ChessColor) -> MoveRestrictions:
+    king_index = get_king_index(board, color)
+    enemy = opponent_color[color]
+    checkers = board.get_attackers(king_index, enemy)
+
+    if not checkers:
+        check_mask = FULL_BOARD
+    elif checkers & (checkers - 1):
+        # Double check, only the king can move
+        check_mask = 0
+    else:
+        checker_index = checkers.bit_length() - 1
+        check_mask = checkers | BETWEEN_MASKS[king_index][checker_index]
+
+    # Enemy sliders that would attack the king on an empty board, a single
+    # piece of color between one of them and the king is pinned
+    pins = dict()
+    occupied = board.occupied
+    own = board.color_bitboards[color]
+    bitboards = board.type_bitboards
+    enemy_pieces = board.color_bitboards[enemy]
+    queens = bitboards[Queen]
+    snipers = rock_attacks(king_index, 0) & (bitboards[Rock] | queens)
+    snipers |= bishop_attacks(king_index, 0) & (bitboards[Bishop] | queens)
+    for sniper_index in iter_indexes(snipers & enemy_pieces):
+        between = BETWEEN_MASKS[king_index][sniper_index]
+        blockers = between & occupied
+        if blockers & own and not blockers & (blockers - 1):
+            pins[blockers.bit_length() - 1] = between | SQUARE_MASKS[sniper_index]
+
+    return MoveRestrictions(king_index, checkers, check_mask, pins)
+
+
+def get_pawn_targets(board: Board, color: ChessColor, index: int) -> int:
+    # Pushes to empty squares and captures of enemy pieces, en passant apart
+    occupied = board.occupied
+    step = _PAWN_STEP[color]
+    targets = PAWN_ATTACKS[color][index] & board.color_bitboards[opponent_color[color]]
+    forward = index + step
+    if 0 <= forward < 64 and not SQUARE_MASKS[forward] & occupied:
+        targets |= SQUARE_MASKS[forward]
+        if POSITIONS[index].coordinates[1] == _PAWN_INITIAL_ROW[color]:
+            if not SQUARE_MASKS[forward + step] & occupied:
+                targets |= SQUARE_MASKS[forward + step]
+    return targets
+
+
+def get_piece_targets(board: Board, piece: Piece, index: int) -> int:
+    # Squares the piece can reach, ignoring the safety of its king
+    if isinstance(piece, Pawn):
+        return get_pawn_targets(board, piece.color, index)
+    return piece.get_attacks(board.occupied) & ~board.color_bitboards[piece.color]
+
+
+def _is_king_destination_safe(
+    board: Board, color: ChessColor, king_index: int, destination: int
+) -> bool:
+    enemy = opponent_color[color]
+    if board.get_attacked_squares(enemy) & SQUARE_MASKS[destination]:
+        return False
+    # The attack maps see the king as a blocker, a slider giving check
+    # along a line still attacks the squares behind the king
+    occupied = board.occupied & ~SQUARE_MASKS[king_index]
+    return not board.get_attackers(destination, enemy, occupied)
+
+
+def _is_en_passant_safe(
+    board: Board, color: ChessColor, king_index: int, origin: int, destination: int
+) -> bool:
+    # Taking en passant removes two pawns from the same row, so it is
+    # verified on the occupancy after the move
+    enemy = opponent_color[color]
+    captured = SQUARE_MASKS[destination - _PAWN_STEP[color]]
+    occupied = (
+        board.occupied & ~SQUARE_MASKS[origin] & ~captured | SQUARE_MASKS[destination]
+    )
+    attackers = board.get_attackers(king_index, enemy, occupied) & ~captured
+    return not attackers
+
+
+def _is_castling_allowed(board: Board, color: ChessColor, castling: Castling) -> bool:
+    if not board.castling_rights & castling.right:
+        return False
+    if board.occupied & castling.empty_squares:
+        return False
+    attacked = board.get_attacked_squares(opponent_color[color])
+    return not attacked & (castling.safe_squares | SQUARE_MASKS[castling.king_origin])
+
+
+def check_move(board: Board, move: Move) -> MoveLegality:
+    origin = move.origin.index
+    destination = move.destination.index
+    piece = board.squares[origin]
+    if piece is None:
+        return MoveLegality.NOT_ALLOWED
+    color = piece.color
+    destination_mask = SQUARE_MASKS[destination]
+
+    if move.castling:
+        castling = next(
+            (
+                c
+                for c in CASTLINGS[color]
+                if (c.king_origin, c.king_destination) == (origin, destination)
+            ),
+            None,
+        )
+        if castling is None or not isinstance(piece, King):
+            return MoveLegality.NOT_ALLOWED
+        if not board.castling_rights & castling.right:
+            return MoveLegality.NOT_ALLOWED
+        if not _is_castling_allowed(board, color, castling):
+            return MoveLegality.KING_IN_CHECK
+        return MoveLegality.LEGAL
+
+    if move.en_passant:
+        # Only the pawn pushed two squares by the last move can be taken
+        captured = board.squares[destination - _PAWN_STEP[color]]
+        if (
+            color != board.side_to_move
+            or move.destination != board.en_passant_position
+            or not isinstance(piece, Pawn)
+            or not PAWN_ATTACKS[color][origin] & destination_mask
+            or board.occupied & destination_mask
+            or not isinstance(captured, Pawn)
+            or captured.color == color
+        ):
+            return MoveLegality.NOT_ALLOWED
+        king_index = get_king_index(board, color)
+        if not _is_en_passant_safe(board, color, king_index, origin, destination):
+            return MoveLegality.KING_IN_CHECK
+        return MoveLegality.LEGAL
+
+    if not get_piece_targets(board, piece, origin) & destination_mask:
+        return MoveLegality.NOT_ALLOWED
+
+    if isinstance(piece, King):
+        if not _is_king_destination_safe(board, color, origin, destination):
+            return MoveLegality.KING_IN_CHECK
+        return MoveLegality.LEGAL
+
+    restrictions = get_move_restrictions(board, color)
+    allowed = restrictions.check_mask & restrictions.pins.get(origin, FULL_BOARD)
+    if not allowed & destination_mask:
+        return MoveLegality.KING_IN_CHECK
+    return MoveLegality.LEGAL
+
+
+def _pawn_moves(color: ChessColor, origin: int, targets: int):
+    last_row = _PAWN_LAST_ROW[color]
+    for destination in iter_indexes(targets):
+        destination_position = POSITIONS[destination]
+        if destination_position.coordinates[1] == last_row:
+            for promotion_class in PROMOTION_CLASSES:
+                yield Move(POSITIONS[origin], destination_position, promotion_class)
+        else:
+            yield Move(POSITIONS[origin], destination_position)
+
+
+def generate_legal_moves(board: Board, color: ChessColor | None = None):
+    return _generate_legal_moves(board, color, captures_only=False)
+
+
+def generate_legal_captures(board: Board, color: ChessColor | None = None):
+    # Captures, en passant included, and promotions
+    return _generate_legal_moves(board, color, captures_only=True)
+
+
+def _generate_legal_moves(board: Board, color: ChessColor | None, captures_only: bool):
+    if color is None:
+        color = board.side_to_move
+    restrictions = get_move_restrictions(board, color)
+    king_index = restrictions.king_index
+    own = board.color_bitboards[color]
+    targets_filter = FULL_BOARD
+    pawn_targets_filter = FULL_BOARD
+    if captures_only:
+        targets_filter = board.color_bitboards[opponent_color[color]]
+        pawn_targets_filter = targets_filter | _LAST_ROW_MASKS[color]
+
+    for destination in iter_indexes(KING_ATTACKS[king_index] & ~own & targets_filter):
+        if _is_king_destination_safe(board, color, king_index, destination):
+            yield Move(POSITIONS[king_index], POSITIONS[destination])
+
+    check_mask = restrictions.check_mask
+    if not check_mask:
+        return
+
+    pins = restrictions.pins
+    occupied = board.occupied
+    not_own = ~own
+    for origin in iter_indexes(own & ~SQUARE_MASKS[king_index]):
+        piece = board.squares[origin]
+        if isinstance(piece, Pawn):
+            targets = get_pawn_targets(board, color, origin) & pawn_targets_filter
+        else:
+            targets = piece.get_attacks(occupied) & not_own & targets_filter
+        targets &= check_mask & pins.get(origin, FULL_BOARD)
+        if not targets:
+            continue
+        if isinstance(piece, Pawn):
+            yield from _pawn_moves(color, origin, targets)
+        else:
+            for destination in iter_indexes(targets):
+                yield Move(POSITIONS[origin], POSITIONS[destination])
+
+    # The en passant square is only open to the side to move
+    en_passant_position = board.en_passant_position
+    if en_passant_position is not None and color == board.side_to_move:
+        destination = en_passant_position.index
+        pawns = own & board.type_bitboards[Pawn]
+        for origin in iter_indexes(
+            PAWN_ATTACKS[opponent_color[color]][destination] & pawns
+        ):
+            if _is_en_passant_safe(board, color, king_index, origin, destination):
+                yield Move(POSITIONS[origin], en_passant_position, en_passant=True)
+
+    if not restrictions.checkers and not captures_only:
+        for castling in CASTLINGS[color]:
+            if _is_castling_allowed(board, color, castling):
+                yield Move(
+                    POSITIONS[castling.king_origin],
+                    POSITIONS[castling.king_destination],
+                    castling=True,
+                )
+
+
+def count_legal_moves(board: Board, color: ChessColor | None = None) -> int:
+    # Same walk as generate_legal_moves, counting target bits instead of
+    # building moves
+    if color is None:
+        color = board.side_to_move
+    restrictions = get_move_restrictions(board, color)
+    king_index = restrictions.king_index
+    own = board.color_bitboards[color]
+
+    count = 0
+    for destination in iter_indexes(KING_ATTACKS[king_index] & ~own):
+        if _is_king_destination_safe(board, color, king_index, destination):
+            count += 1
+
+    check_mask = restrictions.check_mask
+    if not check_mask:
+        return count
+
+    pins = restrictions.pins
+    occupied = board.occupied
+    not_own = ~own
+    last_row = _LAST_ROW_MASKS[color]
+    for origin in iter_indexes(own & ~SQUARE_MASKS[king_index]):
+        piece = board.squares[origin]
+        if isinstance(piece, Pawn):
+            targets = get_pawn_targets(board, color, origin)
+            targets &= check_mask & pins.get(origin, FULL_BOARD)
+            # One move for each promotion class on the last row
+            count += (targets & ~last_row).bit_count()
+            count += (targets & last_row).bit_count() * len(PROMOTION_CLASSES)
+        else:
+            targets = piece.get_attacks(occupied) & not_own
+            count += (targets & check_mask & pins.get(origin, FULL_BOARD)).bit_count()
+
+    en_passant_position = board.en_passant_position
+    if en_passant_position is not None and color == board.side_to_move:
+        destination = en_passant_position.index
+        pawns = own & board.type_bitboards[Pawn]
+        for origin in iter_indexes(
+            PAWN_ATTACKS[opponent_color[color]][destination] & pawns
+        ):
+            if _is_en_passant_safe(board, color, king_index, origin, destination):
+                count += 1
+
+    if not restrictions.checkers:
+        for castling in CASTLINGS[color]:
+            if _is_castling_allowed(board, color, castling):
+                count += 1
+
+    return count
+
+
+def has_legal_move(board: Board, color: ChessColor | None = None) -> bool:
+    # The generator is lazy, king moves come first and the search stops at
+    # the first legal move found
+    return next(generate_legal_moves(board, color), None) is not None
+
+
+def get_game_status(board: Board, color: ChessColor | None = None) -> GameStatus:
+    # Status of the game when it is the turn of color
+    if color is None:
+        color = board.side_to_move
+    if has_legal_move(board, color):
+        return GameStatus.ONGOING
+    if board.is_in_check(color):
+        return GameStatus.CHECKMATE
+    return GameStatus.STALEMATE
+
+
+def perft(board: Board, depth: int, max_workers: int = 1) -> int:
+    # Number of leaf positions at depth, the last ply is only counted
+    if depth <= 0:
+        return 1
+    if depth == 1:
+        return count_legal_moves(board)
+    if max_workers > 1:
+        return sum(_parallel_perft_divide(board, depth, max_workers).values())
+    nodes = 0
+    for move in list(generate_legal_moves(board)):
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def perft_divide(board: Board, depth: int, max_workers: int = 1) -> dict[str, int]:
+    # Leaf positions below each root move, by move in UCI notation. With more
+    # than one worker the root moves are split across a process pool
+    if max_workers > 1:
+        return _parallel_perft_divide(board, depth, max_workers)
+    nodes = dict()
+    for move in list(generate_legal_moves(board)):
+        board.make_move(move)
+        nodes[repr(move)] = perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def _perft_from_fen(fen: str, depth: int) -> int:
+    return perft(Board.from_fen(fen), depth)
+
+
+def _parallel_perft_divide(
+    board: Board, depth: int, max_workers: int
+) -> dict[str, int]:
+    # Workers get the FEN of the position after each root move, which is
+    # much cheaper to send than the board with its pieces
+    fens = dict()
+    for move in list(generate_legal_moves(board)):
+        board.make_move(move)
+        fens[repr(move)] = board.fen()
+        board.unmake_move()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            name: executor.submit(_perft_from_fen, fen, depth - 1)
+            for name, fen in fens.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
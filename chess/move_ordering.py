@@ -0,0 +1,94 @@
+from chess.board import Board
+from chess.models import ChessColor, Move
+from chess.pieces import PIECE_CLASSES, Pawn, Piece
+from chess.transposition import COLOR_INDEX
+
+# Rank of each piece class from pawn to king, for most valuable victim and
+# least valuable attacker
+PIECE_RANKS: dict[type[Piece], int] = {c: i for i, c in enumerate(PIECE_CLASSES)}
+
+KILLERS_PER_PLY = 2
+MAX_PLY = 128
+
+# Order of the groups of moves, a hash move comes first, then captures and
+# promotions, then killers and then the other quiet moves by history
+HASH_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 28
+KILLER_SCORE = 1 << 27
+HISTORY_LIMIT = 1 << 26
+
+
+class MoveOrdering:
+    """
+    Sorts moves so that alpha-beta search tries the likely best ones first.
+
+    Captures are sorted by most valuable victim, then least valuable
+    attacker. Quiet moves that caused a cutoff are kept as killers of their
+    ply and rewarded in a history table by color, origin and destination.
+    """
+
+    def __init__(self) -> None:
+        self.killers: list[list[Move | None]] = [
+            [None] * KILLERS_PER_PLY for _ in range(MAX_PLY)
+        ]
+        self.history: list[list[int]] = [[0] * 64 * 64 for _ in ChessColor]
+
+    def clear(self):
+        for killers in self.killers:
+            killers[:] = [None] * KILLERS_PER_PLY
+        for history in self.history:
+            history[:] = [0] * 64 * 64
+
+    def is_quiet(self, board: Board, move: Move) -> bool:
+        return (
+            board.squares[move.destination.index] is None
+            and not move.en_passant
+            and move.promotion_class is None
+        )
+
+    def score(
+        self, board: Board, move: Move, ply: int, hash_move: Move | None = None
+    ) -> int:
+        if move == hash_move:
+            return HASH_MOVE_SCORE
+
+        origin = move.origin.index
+        destination = move.destination.index
+        victim = board.squares[destination]
+        if victim is not None or move.en_passant or move.promotion_class is not None:
+            attacker_rank = PIECE_RANKS[type(board.squares[origin])]
+            victim_rank = PIECE_RANKS[Pawn if victim is None else type(victim)]
+            if move.promotion_class is not None:
+                victim_rank += PIECE_RANKS[move.promotion_class]
+            return CAPTURE_SCORE + victim_rank * 16 - attacker_rank
+
+        killers = self.killers[ply] if ply < MAX_PLY else ()
+        for slot, killer in enumerate(killers):
+            if move == killer:
+                return KILLER_SCORE - slot
+
+        color_index = COLOR_INDEX[board.squares[origin].color]
+        return self.history[color_index][origin * 64 + destination]
+
+    def order(
+        self, board: Board, moves: list[Move], ply: int, hash_move: Move | None = None
+    ) -> list[Move]:
+        moves.sort(key=lambda m: self.score(board, m, ply, hash_move), reverse=True)
+        return moves
+
+    def record_cutoff(self, board: Board, move: Move, ply: int, depth: int):
+        # Called with the quiet move that failed high, before it is played
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1:] = killers[:-1]
+                killers[0] = move
+
+        color_index = COLOR_INDEX[board.squares[move.origin.index].color]
+        history = self.history[color_index]
+        index = move.origin.index * 64 + move.destination.index
+        history[index] += depth * depth
+        if history[index] >= HISTORY_LIMIT:
+            # Keeps history below the killers, older results weigh less
+            for i, value in enumerate(history):
+                history[i] = value // 2
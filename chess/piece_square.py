@@ -0,0 +1,148 @@
+from chess.models import ChessColor
+from chess.pieces import PIECE_CLASSES, Bishop, King, Knight, Pawn, Piece, Queen, Rock
+
+PIECE_VALUES: dict[type[Piece], int] = {
+    Pawn: 100,
+    Knight: 320,
+    Bishop: 330,
+    Rock: 500,
+    Queen: 900,
+    King: 0,
+}
+
+# Bonus of a piece on each square, seen by white with the 8th row first,
+# so each table reads like a board diagram
+# fmt: off
+_PAWN_TABLE = (
+     0,   0,   0,   0,   0,   0,   0,   0,
+    50,  50,  50,  50,  50,  50,  50,  50,
+    10,  10,  20,  30,  30,  20,  10,  10,
+     5,   5,  10,  25,  25,  10,   5,   5,
+     0,   0,   0,  20,  20,   0,   0,   0,
+     5,  -5, -10,   0,   0, -10,  -5,   5,
+     5,  10,  10, -20, -20,  10,  10,   5,
+     0,   0,   0,   0,   0,   0,   0,   0,
+)
+_PAWN_ENDGAME_TABLE = (
+     0,   0,   0,   0,   0,   0,   0,   0,
+    80,  80,  80,  80,  80,  80,  80,  80,
+    50,  50,  50,  50,  50,  50,  50,  50,
+    30,  30,  30,  30,  30,  30,  30,  30,
+    20,  20,  20,  20,  20,  20,  20,  20,
+    10,  10,  10,  10,  10,  10,  10,  10,
+    10,  10,  10,  10,  10,  10,  10,  10,
+     0,   0,   0,   0,   0,   0,   0,   0,
+)
+_KNIGHT_TABLE = (
+   -50, -40, -30, -30, -30, -30, -40, -50,
+   -40, -20,   0,   0,   0,   0, -20, -40,
+   -30,   0,  10,  15,  15,  10,   0, -30,
+   -30,   5,  15,  20,  20,  15,   5, -30,
+   -30,   0,  15,  20,  20,  15,   0, -30,
+   -30,   5,  10,  15,  15,  10,   5, -30,
+   -40, -20,   0,   5,   5,   0, -20, -40,
+   -50, -40, -30, -30, -30, -30, -40, -50,
+)
+_BISHOP_TABLE = (
+   -20, -10, -10, -10, -10, -10, -10, -20,
+   -10,   0,   0,   0,   0,   0,   0, -10,
+   -10,   0,   5,  10,  10,   5,   0, -10,
+   -10,   5,   5,  10,  10,   5,   5, -10,
+   -10,   0,  10,  10,  10,  10,   0, -10,
+   -10,  10,  10,  10,  10,  10,  10, -10,
+   -10,   5,   0,   0,   0,   0,   5, -10,
+   -20, -10, -10, -10, -10, -10, -10, -20,
+)
+_ROCK_TABLE = (
+     0,   0,   0,   0,   0,   0,   0,   0,
+     5,  10,  10,  10,  10,  10,  10,   5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+     0,   0,   0,   5,   5,   0,   0,   0,
+)
+_QUEEN_TABLE = (
+   -20, -10, -10,  -5,  -5, -10, -10, -20,
+   -10,   0,   0,   0,   0,   0,   0, -10,
+   -10,   0,   5,   5,   5,   5,   0, -10,
+    -5,   0,   5,   5,   5,   5,   0,  -5,
+     0,   0,   5,   5,   5,   5,   0,  -5,
+   -10,   5,   5,   5,   5,   5,   0, -10,
+   -10,   0,   5,   0,   0,   0,   0, -10,
+   -20, -10, -10,  -5,  -5, -10, -10, -20,
+)
+_KING_TABLE = (
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -30, -40, -40, -50, -50, -40, -40, -30,
+   -20, -30, -30, -40, -40, -30, -30, -20,
+   -10, -20, -20, -20, -20, -20, -20, -10,
+    20,  20,   0,   0,   0,   0,  20,  20,
+    20,  30,  10,   0,   0,  10,  30,  20,
+)
+_KING_ENDGAME_TABLE = (
+   -50, -40, -30, -20, -20, -30, -40, -50,
+   -30, -20, -10,   0,   0, -10, -20, -30,
+   -30, -10,  20,  30,  30,  20, -10, -30,
+   -30, -10,  30,  40,  40,  30, -10, -30,
+   -30, -10,  30,  40,  40,  30, -10, -30,
+   -30, -10,  20,  30,  30,  20, -10, -30,
+   -30, -30,   0,   0,   0,   0, -30, -30,
+   -50, -30, -30, -30, -30, -30, -30, -50,
+)
+# fmt: on
+
+_MIDGAME_TABLES: dict[type[Piece], tuple[int, ...]] = {
+    Pawn: _PAWN_TABLE,
+    Knight: _KNIGHT_TABLE,
+    Bishop: _BISHOP_TABLE,
+    Rock: _ROCK_TABLE,
+    Queen: _QUEEN_TABLE,
+    King: _KING_TABLE,
+}
+_ENDGAME_TABLES: dict[type[Piece], tuple[int, ...]] = {
+    **_MIDGAME_TABLES,
+    Pawn: _PAWN_ENDGAME_TABLE,
+    King: _KING_ENDGAME_TABLE,
+}
+
+# Weight of each piece in the game phase. All the pieces of the initial
+# position add up to MAX_PHASE, bare kings to 0
+PHASE_WEIGHTS: dict[type[Piece], int] = {
+    Pawn: 0,
+    Knight: 1,
+    Bishop: 1,
+    Rock: 2,
+    Queen: 4,
+    King: 0,
+}
+MAX_PHASE = 24
+
+
+def _square_scores(
+    tables: dict[type[Piece], tuple[int, ...]],
+) -> dict[tuple[ChessColor, type], tuple[int, ...]]:
+    # Material plus square bonus by square index, positive for white and
+    # negative for black, whose tables are mirrored
+    scores = dict()
+    for piece_class in PIECE_CLASSES:
+        table = tables[piece_class]
+        value = PIECE_VALUES[piece_class]
+        scores[(ChessColor.WHITE, piece_class)] = tuple(
+            value + table[(7 - index // 8) * 8 + index % 8] for index in range(64)
+        )
+        scores[(ChessColor.BLACK, piece_class)] = tuple(
+            -value - table[index] for index in range(64)
+        )
+    return scores
+
+
+MIDGAME_SCORES: dict[tuple[ChessColor, type], tuple[int, ...]] = _square_scores(
+    _MIDGAME_TABLES
+)
+ENDGAME_SCORES: dict[tuple[ChessColor, type], tuple[int, ...]] = _square_scores(
+    _ENDGAME_TABLES
+)
@@ -1,9 +1,22 @@
 from enum import Enum
 from abc import ABC, abstractmethod
 
+from chess.bitboard import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    bishop_attacks,
+    bitboard_2_positions,
+    queen_attacks,
+    rock_attacks,
+)
 from chess.models import (
+    NEIGHBOURS,
     PIECE_SYMBOLS,
+    POSITIONS,
+    RAYS,
     ChessColor,
+    Direction,
     LetterPosition,
     NumberPosition,
     Position,
@@ -20,6 +33,11 @@ class Piece(ABC):
     def get_possible_positions_to_move(self) -> list[Position]:
         ...
 
+    @abstractmethod
+    def get_attacks(self, occupancy: int = 0) -> int:
+        # Bitboard of squares attacked by the piece given the occupied squares
+        ...
+
     def move(self, next_position: Position):
         self.current_position = next_position
         self.num_movements += 1
@@ -36,216 +54,142 @@ class Pawn(Piece):
     def __init__(self, color: ChessColor, current_position: Position) -> None:
         super().__init__(color, current_position)
 
+    def get_attacks(self, occupancy: int = 0) -> int:
+        return PAWN_ATTACKS[self.color][self.current_position.index]
+
     def get_possible_positions_to_move(self) -> list[Position]:
-        possible_positions = [
-            self.current_position.get_up_position(),
-            self.current_position.get_left_up_position(),
-            self.current_position.get_right_up_position(),
-        ]
-        if self.num_movements == 0:
-            try:
-                if self.color == ChessColor.WHITE:
-                    possible_positions.append(
-                        self.current_position.get_up_position().get_up_position()
-                    )
-                else:
-                    possible_positions.append(
-                        self.current_position.get_down_position().get_down_position()
-                    )
-            except AttributeError:
-                pass
-
-        return [p for p in possible_positions if p is not None]
+        return list(_PAWN_POSITIONS[self.color][self.current_position.index])
 
 
 class Knight(Piece):
     def __init__(self, color: ChessColor, current_position: Position) -> None:
         super().__init__(color, current_position)
 
+    def get_attacks(self, occupancy: int = 0) -> int:
+        return KNIGHT_ATTACKS[self.current_position.index]
+
     def get_possible_positions_to_move(self) -> list[Position]:
-        possible_positions: list[Position] = list()
-
-        try:
-            possible_positions.append(
-                self.current_position.get_right_up_position().get_up_position()
-            )
-        except AttributeError:
-            pass
-
-        try:
-            possible_positions.append(
-                self.current_position.get_right_up_position().get_right_position()
-            )
-        except AttributeError:
-            pass
-
-        try:
-            possible_positions.append(
-                self.current_position.get_right_down_position().get_down_position()
-            )
-        except AttributeError:
-            pass
-
-        try:
-            possible_positions.append(
-                self.current_position.get_right_down_position().get_right_position()
-            )
-        except AttributeError:
-            pass
-
-        try:
-            possible_positions.append(
-                self.current_position.get_left_up_position().get_up_position()
-            )
-        except AttributeError:
-            pass
-
-        try:
-            possible_positions.append(
-                self.current_position.get_left_up_position().get_left_position()
-            )
-        except AttributeError:
-            pass
-
-        try:
-            possible_positions.append(
-                self.current_position.get_left_down_position().get_down_position()
-            )
-        except AttributeError:
-            pass
-
-        try:
-            possible_positions.append(
-                self.current_position.get_left_down_position().get_left_position()
-            )
-        except AttributeError:
-            pass
-
-        possible_positions = [pos for pos in possible_positions if pos is not None]
-        return possible_positions
+        return list(_KNIGHT_POSITIONS[self.current_position.index])
+
+    def get_moves(self, own_occupancy: int) -> int:
+        # Knight destinations not occupied by pieces of the same color
+        return KNIGHT_ATTACKS[self.current_position.index] & ~own_occupancy
 
 
 class Bishop(Piece):
     def __init__(self, color: ChessColor, current_position: Position) -> None:
         super().__init__(color, current_position)
 
+    def get_attacks(self, occupancy: int = 0) -> int:
+        return bishop_attacks(self.current_position.index, occupancy)
+
     def get_possible_positions_to_move(self) -> list[Position]:
-        return list(get_first_diagonal(self.current_position)) + list(
-            get_second_diagonal(self.current_position)
-        )
+        return list(_BISHOP_POSITIONS[self.current_position.index])
 
 
 class Rock(Piece):
     def __init__(self, color: ChessColor, current_position: Position) -> None:
         super().__init__(color, current_position)
 
+    def get_attacks(self, occupancy: int = 0) -> int:
+        return rock_attacks(self.current_position.index, occupancy)
+
     def get_possible_positions_to_move(self) -> list[Position]:
-        return list(get_column(self.current_position)) + list(
-            get_row(self.current_position)
-        )
+        return list(_ROCK_POSITIONS[self.current_position.index])
 
 
 class Queen(Piece):
     def __init__(self, color: ChessColor, current_position: Position) -> None:
         super().__init__(color, current_position)
 
+    def get_attacks(self, occupancy: int = 0) -> int:
+        return queen_attacks(self.current_position.index, occupancy)
+
     def get_possible_positions_to_move(self) -> list[Position]:
-        return (
-            list(get_column(self.current_position))
-            + list(get_row(self.current_position))
-            + list(get_first_diagonal(self.current_position))
-            + list(get_second_diagonal(self.current_position))
-        )
+        return list(_QUEEN_POSITIONS[self.current_position.index])
 
 
 class King(Piece):
     def __init__(self, color: ChessColor, current_position: Position) -> None:
         super().__init__(color, current_position)
 
+    def get_attacks(self, occupancy: int = 0) -> int:
+        return KING_ATTACKS[self.current_position.index]
+
     def get_possible_positions_to_move(self) -> list[Position]:
-        possible_positions = [
-            self.current_position.get_up_position(),
-            self.current_position.get_down_position(),
-            self.current_position.get_left_position(),
-            self.current_position.get_right_position(),
-            self.current_position.get_right_up_position(),
-            self.current_position.get_right_down_position(),
-            self.current_position.get_left_up_position(),
-            self.current_position.get_left_down_position(),
-        ]
+        return list(_KING_POSITIONS[self.current_position.index])
+
 
-        possible_positions = [pos for pos in possible_positions if pos is not None]
-        return possible_positions
+PIECE_CLASSES: tuple[type[Piece], ...] = (Pawn, Knight, Bishop, Rock, Queen, King)
 
 
 def get_column(current_position: Position):
-    position = current_position
-    while True:
-        position = position.get_up_position()
-        if position is not None:
-            yield position
-        else:
-            break
-
-    position = current_position
-    while True:
-        position = position.get_down_position()
-        if position is not None:
-            yield position
-        else:
-            break
+    index = current_position.index
+    return RAYS[Direction.UP][index] + RAYS[Direction.DOWN][index]
 
 
 def get_row(current_position: Position):
-    position = current_position
-    while True:
-        position = position.get_left_position()
-        if position is not None:
-            yield position
-        else:
-            break
-
-    position = current_position
-    while True:
-        position = position.get_right_position()
-        if position is not None:
-            yield position
-        else:
-            break
+    index = current_position.index
+    return RAYS[Direction.LEFT][index] + RAYS[Direction.RIGHT][index]
 
 
 def get_first_diagonal(current_position: Position):
-    position = current_position
-    while True:
-        position = position.get_left_up_position()
-        if position is not None:
-            yield position
-        else:
-            break
-
-    position = current_position
-    while True:
-        position = position.get_right_down_position()
-        if position is not None:
-            yield position
-        else:
-            break
+    index = current_position.index
+    return RAYS[Direction.LEFT_UP][index] + RAYS[Direction.RIGHT_DOWN][index]
 
 
 def get_second_diagonal(current_position: Position):
-    position = current_position
-    while True:
-        position = position.get_left_down_position()
-        if position is not None:
-            yield position
-        else:
-            break
-
-    position = current_position
-    while True:
-        position = position.get_right_up_position()
-        if position is not None:
-            yield position
-        else:
-            break
+    index = current_position.index
+    return RAYS[Direction.LEFT_DOWN][index] + RAYS[Direction.RIGHT_UP][index]
+
+
+def _build_pawn_positions(color: ChessColor):
+    if color == ChessColor.WHITE:
+        forward, left, right = Direction.UP, Direction.LEFT_UP, Direction.RIGHT_UP
+        initial_row = 2
+    else:
+        forward, left, right = (
+            Direction.DOWN,
+            Direction.LEFT_DOWN,
+            Direction.RIGHT_DOWN,
+        )
+        initial_row = 7
 
+    pawn_positions = list()
+    for position in POSITIONS:
+        index = position.index
+        possible_positions = [
+            NEIGHBOURS[forward][index],
+            NEIGHBOURS[left][index],
+            NEIGHBOURS[right][index],
+        ]
+        if position.coordinates[1] == initial_row:
+            # Two squares forward on the first move
+            possible_positions.append(RAYS[forward][index][1])
+        pawn_positions.append(tuple(p for p in possible_positions if p is not None))
+
+    return tuple(pawn_positions)
+
+
+# Positions reachable on an empty board, indexed by the index of current position
+_PAWN_POSITIONS = {color: _build_pawn_positions(color) for color in ChessColor}
+_KING_POSITIONS = tuple(
+    tuple(
+        NEIGHBOURS[d][position.index]
+        for d in Direction
+        if NEIGHBOURS[d][position.index] is not None
+    )
+    for position in POSITIONS
+)
+_KNIGHT_POSITIONS = tuple(
+    tuple(bitboard_2_positions(KNIGHT_ATTACKS[position.index]))
+    for position in POSITIONS
+)
+_ROCK_POSITIONS = tuple(get_column(p) + get_row(p) for p in POSITIONS)
+_BISHOP_POSITIONS = tuple(
+    get_first_diagonal(p) + get_second_diagonal(p) for p in POSITIONS
+)
+_QUEEN_POSITIONS = tuple(
+    rock_positions + bishop_positions
+    for rock_positions, bishop_positions in zip(_ROCK_POSITIONS, _BISHOP_POSITIONS)
+)
@@ -0,0 +1,429 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from typing import Callable, NamedTuple
+
+from chess.evaluation import evaluate
+from chess.exchange import static_exchange_evaluation
+from chess.game import Game
+from chess.models import Move
+from chess.move_generator import generate_legal_captures, generate_legal_moves
+from chess.move_ordering import MoveOrdering
+from chess.pieces import Queen
+from chess.tablebase import Outcome, Tablebase
+from chess.transposition import (
+    DEFAULT_MAX_MEMORY_IN_BYTES,
+    SharedTranspositionTable,
+    TranspositionTable,
+)
+
+# Scores above MATE_THRESHOLD are mates, the closer to MATE_SCORE the sooner
+MATE_SCORE = 100_000
+MATE_THRESHOLD = MATE_SCORE - 1_000
+INFINITE_SCORE = MATE_SCORE + 1
+MAX_DEPTH = 64
+
+# The node and time limits are checked once every CHECK_TIME_EVERY_NODES
+# nodes. Reading the clock costs little next to one node of this search, so
+# it is read often enough to stop within a few milliseconds of the deadline
+CHECK_TIME_EVERY_NODES = 64
+# A new iteration is not started past this fraction of the time budget, as
+# it would most likely be cut at the deadline
+SOFT_TIME_FRACTION = 0.5
+# Without moves to go, the time left on the clock is shared as if this many
+# moves were left to the time control. CLOCK_RESERVE seconds are always
+# kept for the overhead around the search
+DEFAULT_MOVES_TO_GO = 30
+CLOCK_RESERVE = 0.05
+
+
+class SearchResult(NamedTuple):
+    best_move: Move | None
+    # Centipawns from the point of view of the side to move
+    score: int
+    depth: int
+    nodes: int
+    seconds: float
+    principal_variation: list[Move]
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        line = " ".join(repr(m) for m in self.principal_variation)
+        return (
+            f"depth {self.depth} score {self.score} nodes {self.nodes} "
+            f"nps {self.nodes_per_second:.0f} pv {line}"
+        )
+
+
+class _SearchAborted(Exception):
+    pass
+
+
+def time_for_move(
+    clock: float, increment: float = 0.0, moves_to_go: int | None = None
+) -> float:
+    # Seconds to spend on the next move with clock seconds left, gaining
+    # increment seconds after each move
+    available = max(clock - CLOCK_RESERVE, 0.0)
+    budget = available / (moves_to_go or DEFAULT_MOVES_TO_GO) + increment
+    return min(budget, available)
+
+
+class Search:
+    """
+    Negamax alpha-beta search with iterative deepening.
+
+    Moves are played and taken back on the board of the game with make_move
+    and unmake_move, the board is never copied. The best move of each node
+    is kept in the transposition table and tried first by the next
+    iteration, then moves follow the MoveOrdering heuristics. Without move
+    ordering only the previous principal variation is tried first.
+    The node limit and the time limit, a deadline, are polled every
+    CHECK_TIME_EVERY_NODES nodes: an iteration cut by them is dropped and the
+    result of the last completed one is returned. The node limit never cuts
+    the first iteration. When the deadline or stop, which may be called from
+    another thread, cuts it, the root move ordered first is returned.
+    With a seed, the root moves after the first one are shuffled, so the
+    helpers of a parallel search look at the root moves in different orders.
+    Below the root, positions of the tablebase of the game are not searched,
+    their exact score is read from it.
+    """
+
+    def __init__(
+        self,
+        game: Game,
+        transposition_table: (
+            TranspositionTable | SharedTranspositionTable | None
+        ) = None,
+        move_ordering: bool = True,
+        quiescence: bool = True,
+        seed: int | None = None,
+    ) -> None:
+        self.game = game
+        self.board = game.board
+        if transposition_table is None:
+            transposition_table = game.transposition_table or TranspositionTable()
+        self.transposition_table = transposition_table
+        self.move_ordering = MoveOrdering() if move_ordering else None
+        self.quiescence = quiescence
+        # Captures are always sorted by victim and attacker
+        self._capture_ordering = self.move_ordering or MoveOrdering()
+        self._random = Random(seed) if seed is not None else None
+        self.tablebase = game.tablebase
+        self._deadline: float | None = None
+        self._max_nodes: int | None = None
+        self._stop_requested = False
+        self.nodes = 0
+        self._previous_variation: list[Move] = list()
+
+    def search(
+        self,
+        max_depth: int = MAX_DEPTH,
+        max_nodes: int | None = None,
+        max_time: float | None = None,
+        report: Callable[[SearchResult], None] | None = None,
+        clock: float | None = None,
+        increment: float = 0.0,
+        moves_to_go: int | None = None,
+    ) -> SearchResult:
+        # With clock, the seconds left to play, the time limit is a share of
+        # it, capped by max_time
+        if clock is not None:
+            budget = time_for_move(clock, increment, moves_to_go)
+            max_time = budget if max_time is None else min(max_time, budget)
+        self.nodes = 0
+        self._previous_variation = list()
+        if self.move_ordering is not None:
+            self.move_ordering.clear()
+        start = time.perf_counter()
+        history_length = len(self.board.history)
+        result = SearchResult(None, 0, 0, 0, 0.0, list())
+
+        for depth in range(1, max_depth + 1):
+            variation: list[Move] = list()
+            # The node limit only cuts the iterations after the first, the
+            # deadline cuts any of them
+            if max_time is not None:
+                self._deadline = start + max_time
+            if depth > 1:
+                self._max_nodes = max_nodes
+            try:
+                score = self._negamax(
+                    depth, -INFINITE_SCORE, INFINITE_SCORE, 0, variation
+                )
+            except _SearchAborted:
+                while len(self.board.history) > history_length:
+                    self.board.unmake_move()
+                result = result._replace(
+                    nodes=self.nodes, seconds=time.perf_counter() - start
+                )
+                if result.best_move is None:
+                    # Cut before the first iteration completed, the move
+                    # ordered first is played, the hash move when there is one
+                    moves = self._ordered_moves(0)
+                    if moves:
+                        result = result._replace(
+                            best_move=moves[0],
+                            score=evaluate(self.board),
+                            principal_variation=moves[:1],
+                        )
+                break
+            finally:
+                self._deadline = None
+                self._max_nodes = None
+            seconds = time.perf_counter() - start
+            result = SearchResult(
+                variation[0] if variation else None,
+                score,
+                depth,
+                self.nodes,
+                seconds,
+                variation,
+            )
+            if report is not None:
+                report(result)
+            self._previous_variation = variation
+
+            if not variation or abs(score) > MATE_THRESHOLD:
+                # No legal move or a forced mate was found
+                break
+            if max_nodes is not None and self.nodes >= max_nodes:
+                break
+            if max_time is not None and seconds >= max_time * SOFT_TIME_FRACTION:
+                break
+
+        # A stop does not carry over to the next search
+        self._stop_requested = False
+        return result
+
+    def stop(self):
+        self._stop_requested = True
+
+    def _check_limits(self):
+        if self.nodes % CHECK_TIME_EVERY_NODES:
+            return
+        if (
+            self._stop_requested
+            or (self._max_nodes is not None and self.nodes >= self._max_nodes)
+            or (self._deadline is not None and time.perf_counter() >= self._deadline)
+        ):
+            raise _SearchAborted()
+
+    def _probe_tablebase(self, ply: int) -> int | None:
+        tablebase = self.tablebase
+        if tablebase is None or self.board.occupied.bit_count() > tablebase.max_pieces:
+            return None
+        result = tablebase.probe(self.board)
+        if result is None:
+            return None
+        if result.outcome == Outcome.WIN:
+            return MATE_SCORE - ply - result.plies
+        if result.outcome == Outcome.LOSS:
+            return -MATE_SCORE + ply + result.plies
+        return 0
+
+    def _ordered_moves(self, ply: int) -> list[Move]:
+        moves = list(generate_legal_moves(self.board))
+        if self.move_ordering is not None:
+            hash_move = self.transposition_table.probe_best_move(self.board.zobrist_key)
+            self.move_ordering.order(self.board, moves, ply, hash_move)
+        elif ply < len(self._previous_variation):
+            pv_move = self._previous_variation[ply]
+            if pv_move in moves:
+                moves.remove(pv_move)
+                moves.insert(0, pv_move)
+
+        if ply == 0 and self._random is not None:
+            other_moves = moves[1:]
+            self._random.shuffle(other_moves)
+            moves[1:] = other_moves
+        return moves
+
+    def _negamax(
+        self, depth: int, alpha: int, beta: int, ply: int, variation: list[Move]
+    ) -> int:
+        self.nodes += 1
+        self._check_limits()
+        board = self.board
+        if ply:
+            score = self._probe_tablebase(ply)
+            if score is not None:
+                return score
+        if depth == 0:
+            if self.quiescence:
+                # The node is counted again by the quiescence search
+                self.nodes -= 1
+                return self._quiescence(alpha, beta, ply)
+            return evaluate(board)
+
+        moves = self._ordered_moves(ply)
+        if not moves:
+            if board.is_in_check(board.side_to_move):
+                return -MATE_SCORE + ply
+            return 0
+
+        best_move = None
+        for move in moves:
+            child_variation: list[Move] = list()
+            board.make_move(move)
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1, child_variation)
+            board.unmake_move()
+
+            if score > alpha:
+                alpha = score
+                best_move = move
+                variation[:] = [move] + child_variation
+                if alpha >= beta:
+                    ordering = self.move_ordering
+                    if ordering is not None and ordering.is_quiet(board, move):
+                        ordering.record_cutoff(board, move, ply, depth)
+                    break
+
+        if best_move is not None:
+            self.transposition_table.store_best_move(
+                board.zobrist_key, best_move, depth
+            )
+        return alpha
+
+    def _quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        # Plays captures and queen promotions until the position is quiet,
+        # leaving out captures that lose material on their square
+        self.nodes += 1
+        self._check_limits()
+        board = self.board
+        score = self._probe_tablebase(ply)
+        if score is not None:
+            return score
+        if board.is_in_check(board.side_to_move):
+            # Standing pat is not an option, every evasion is tried
+            moves = list(generate_legal_moves(board))
+            if not moves:
+                return -MATE_SCORE + ply
+        else:
+            stand_pat = evaluate(board)
+            if stand_pat >= beta:
+                return beta
+            alpha = max(alpha, stand_pat)
+            moves = [
+                move
+                for move in generate_legal_captures(board)
+                if move.promotion_class in (None, Queen)
+                and (
+                    move.promotion_class is not None
+                    or static_exchange_evaluation(board, move) >= 0
+                )
+            ]
+        self._capture_ordering.order(board, moves, ply)
+
+        for move in moves:
+            board.make_move(move)
+            score = -self._quiescence(-beta, -alpha, ply + 1)
+            board.unmake_move()
+            if score >= beta:
+                return beta
+            alpha = max(alpha, score)
+        return alpha
+
+
+def search(
+    game: Game,
+    max_depth: int = MAX_DEPTH,
+    max_nodes: int | None = None,
+    max_time: float | None = None,
+    report: Callable[[SearchResult], None] | None = None,
+    clock: float | None = None,
+    increment: float = 0.0,
+    moves_to_go: int | None = None,
+) -> SearchResult:
+    return Search(game).search(
+        max_depth, max_nodes, max_time, report, clock, increment, moves_to_go
+    )
+
+
+def _search_worker(
+    fen: str,
+    tablebase: Tablebase | None,
+    transposition_table: SharedTranspositionTable,
+    worker: int,
+    max_depth: int,
+    max_nodes: int | None,
+    deadline: float | None,
+) -> SearchResult:
+    # Helpers shuffle the root moves after the hash move, so they search
+    # different trees to the same max_depth. The deadline is in wall clock
+    # time, so the time taken to start the worker counts
+    max_time = None if deadline is None else max(deadline - time.time(), 0.0)
+    try:
+        return Search(
+            Game(fen=fen, tablebase=tablebase),
+            transposition_table=transposition_table,
+            seed=worker if worker else None,
+        ).search(max_depth, max_nodes, max_time)
+    finally:
+        transposition_table.close()
+
+
+def parallel_search(
+    game: Game,
+    max_depth: int = MAX_DEPTH,
+    max_nodes: int | None = None,
+    max_time: float | None = None,
+    max_workers: int | None = None,
+    max_memory: int = DEFAULT_MAX_MEMORY_IN_BYTES,
+    clock: float | None = None,
+    increment: float = 0.0,
+    moves_to_go: int | None = None,
+) -> SearchResult:
+    """
+    Lazy SMP. Each worker process searches the position of the game on its
+    own, sharing the best moves it finds through a SharedTranspositionTable,
+    and the result of the deepest search wins, the first worker's on ties.
+    The limits apply to each worker, nodes are the total of all workers.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 1:
+        return search(
+            game,
+            max_depth,
+            max_nodes,
+            max_time,
+            clock=clock,
+            increment=increment,
+            moves_to_go=moves_to_go,
+        )
+
+    start = time.perf_counter()
+    if clock is not None:
+        budget = time_for_move(clock, increment, moves_to_go)
+        max_time = budget if max_time is None else min(max_time, budget)
+    deadline = None if max_time is None else time.time() + max_time
+    fen = game.fen()
+    transposition_table = SharedTranspositionTable(max_memory)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _search_worker,
+                    fen,
+                    game.tablebase,
+                    transposition_table,
+                    worker,
+                    max_depth,
+                    max_nodes,
+                    deadline,
+                )
+                for worker in range(max_workers)
+            ]
+            results = [future.result() for future in futures]
+    finally:
+        transposition_table.close()
+
+    best = max(results, key=lambda r: r.depth)
+    return best._replace(
+        nodes=sum(r.nodes for r in results), seconds=time.perf_counter() - start
+    )
@@ -0,0 +1,526 @@
+"""
+Endgame tablebases built by retrograde analysis.
+
+A table holds one byte for each position of a material, such as KQK or
+KQKR, with the white pieces first. The byte is 0 for a draw or an illegal
+position, else the number of plies to mate plus one: odd numbers of plies
+are wins for the side to move, even numbers losses, 0 plies is checkmate.
+Castling, en passant and the fifty move rule are left out.
+
+Build tables from the repository root with:
+    python -m chess.tablebase directory KQK KRK KPK KBNK
+"""
+import argparse
+import mmap
+import os
+from enum import Enum
+from functools import lru_cache
+from typing import Iterator, NamedTuple
+
+from chess.bitboard import (
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    SQUARE_MASKS,
+    bishop_attacks,
+    iter_indexes,
+    queen_attacks,
+    rock_attacks,
+)
+from chess.board import Board
+from chess.fen import FEN_PIECE_CLASSES
+from chess.models import PIECE_LETTERS, ChessColor, ChessException, opponent_color
+from chess.move_generator import PROMOTION_CLASSES
+from chess.piece_square import PIECE_VALUES
+from chess.pieces import Bishop, King, Knight, Pawn, Piece, Queen, Rock
+
+MAX_PIECES = 4
+TABLE_EXTENSION = ".tb"
+# Longest distance to mate a table can store, in plies
+MAX_PLIES = 254
+
+# Order of the pieces of each side in a material name and in a table index
+_PIECE_ORDER = (King, Queen, Rock, Bishop, Knight, Pawn)
+_SIDE_INDEX = {ChessColor.WHITE: 0, ChessColor.BLACK: 1}
+_SIDES = (ChessColor.WHITE, ChessColor.BLACK)
+
+# A table piece is its class, its color and its square index
+TablePiece = tuple[type[Piece], ChessColor, int]
+
+
+def _transform(function) -> tuple[int, ...]:
+    return tuple(function(i % 8, i // 8) for i in range(64))
+
+
+# The 8 symmetries of the board. Only the first 2, the identity and the
+# mirror of the columns, keep pawns moving the same way
+_TRANSFORMS: tuple[tuple[int, ...], ...] = tuple(
+    _transform(function)
+    for function in (
+        lambda x, y: x + 8 * y,
+        lambda x, y: (7 - x) + 8 * y,
+        lambda x, y: x + 8 * (7 - y),
+        lambda x, y: (7 - x) + 8 * (7 - y),
+        lambda x, y: y + 8 * x,
+        lambda x, y: (7 - y) + 8 * x,
+        lambda x, y: y + 8 * (7 - x),
+        lambda x, y: (7 - y) + 8 * (7 - x),
+    )
+)
+# Squares of the white king in a table, the others are found by symmetry.
+# With pawns the columns a to d, else the triangle a1-d1-d4
+_PAWN_KING_SQUARES = tuple(i for i in range(64) if i % 8 < 4)
+_KING_SQUARES = tuple(i for i in range(64) if i // 8 <= i % 8 < 4)
+
+_LAST_ROWS = {ChessColor.WHITE: 7, ChessColor.BLACK: 0}
+_PAWN_STEPS = {ChessColor.WHITE: 8, ChessColor.BLACK: -8}
+_PAWN_INITIAL_ROWS = {ChessColor.WHITE: 1, ChessColor.BLACK: 6}
+
+
+def _attacks(piece_class: type[Piece], color: ChessColor, index: int, occupied: int):
+    if piece_class is King:
+        return KING_ATTACKS[index]
+    if piece_class is Knight:
+        return KNIGHT_ATTACKS[index]
+    if piece_class is Pawn:
+        return PAWN_ATTACKS[color][index]
+    if piece_class is Bishop:
+        return bishop_attacks(index, occupied)
+    if piece_class is Rock:
+        return rock_attacks(index, occupied)
+    return queen_attacks(index, occupied)
+
+
+def _is_attacked(index: int, color: ChessColor, pieces: list[TablePiece]) -> bool:
+    # Whether a piece of color attacks the square index
+    occupied = 0
+    for _, _, square in pieces:
+        occupied |= SQUARE_MASKS[square]
+    mask = SQUARE_MASKS[index]
+    for piece_class, piece_color, square in pieces:
+        if (
+            piece_color == color
+            and _attacks(piece_class, color, square, occupied) & mask
+        ):
+            return True
+    return False
+
+
+def _king_square(pieces: list[TablePiece], color: ChessColor) -> int:
+    return next(s for c, pc, s in pieces if c is King and pc == color)
+
+
+def _split_material(material: str) -> tuple[str, str]:
+    second_king = material.find("K", 1)
+    if (
+        not material.startswith("K")
+        or second_king < 0
+        or any(letter.lower() not in FEN_PIECE_CLASSES for letter in material)
+    ):
+        raise ChessException(f"Invalid material {material}")
+    return material[:second_king], material[second_king:]
+
+
+def _material_value(letters: str) -> int:
+    return sum(PIECE_VALUES[FEN_PIECE_CLASSES[letter.lower()]] for letter in letters)
+
+
+def _sort_letters(letters: str) -> str:
+    order = [PIECE_LETTERS[c.__name__].upper() for c in _PIECE_ORDER]
+    return "".join(sorted(letters, key=order.index))
+
+
+def canonical_material(material: str) -> str:
+    # Name of the table of a material, the side with more material is white
+    white, black = (_sort_letters(side) for side in _split_material(material.upper()))
+    if (_material_value(black), black) > (_material_value(white), white):
+        white, black = black, white
+    return white + black
+
+
+@lru_cache(maxsize=None)
+def _table_order(
+    signature: tuple[tuple[type[Piece], ChessColor], ...],
+) -> tuple[str, bool, tuple[int, ...]]:
+    # Material of the table of pieces with the classes and colors of the
+    # signature, whether colors are swapped to read it and the order of the
+    # pieces in the table
+    letters = {c: "" for c in ChessColor}
+    for piece_class, color in signature:
+        letters[color] += PIECE_LETTERS[piece_class.__name__].upper()
+    white, black = (_sort_letters(letters[c]) for c in _SIDES)
+    material = canonical_material(white + black)
+    swapped = material != white + black
+    order = sorted(
+        range(len(signature)),
+        key=lambda i: (
+            _SIDE_INDEX[signature[i][1]] != swapped,
+            _PIECE_ORDER.index(signature[i][0]),
+        ),
+    )
+    return material, swapped, tuple(order)
+
+
+def _normalize(
+    pieces: list[TablePiece], side: ChessColor
+) -> tuple[str, tuple[int, ...], ChessColor]:
+    # Material of the table of the position, squares of the pieces in the
+    # order of the table and side to move. Tables are stored for one side,
+    # the position of the other is read with colors swapped and rows mirrored
+    material, swapped, order = _table_order(tuple((c, color) for c, color, _ in pieces))
+    if swapped:
+        return material, tuple(pieces[i][2] ^ 56 for i in order), opponent_color[side]
+    return material, tuple(pieces[i][2] for i in order), side
+
+
+class _Layout:
+    # Index of the positions of a material in its table. The white king only
+    # takes the squares of _KING_SQUARES, or _PAWN_KING_SQUARES with pawns,
+    # and each position is stored once, under its least symmetric image
+
+    def __init__(self, material: str) -> None:
+        white, black = _split_material(material)
+        self.classes: tuple[type[Piece], ...] = tuple(
+            FEN_PIECE_CLASSES[letter.lower()] for letter in white + black
+        )
+        self.colors: tuple[ChessColor, ...] = (ChessColor.WHITE,) * len(white) + (
+            ChessColor.BLACK,
+        ) * len(black)
+        self.num_pieces = len(self.classes)
+        has_pawns = Pawn in self.classes
+        transforms = _TRANSFORMS[:2] if has_pawns else _TRANSFORMS
+        self.king_squares = _PAWN_KING_SQUARES if has_pawns else _KING_SQUARES
+        self.king_slots = {s: slot for slot, s in enumerate(self.king_squares)}
+        # Symmetries that take each square of the white king to the table
+        self.king_transforms = [
+            [t for t in transforms if t[s] in self.king_slots] for s in range(64)
+        ]
+        self.size = 2 * len(self.king_squares) * 64 ** (self.num_pieces - 1)
+
+    def index(self, squares: tuple[int, ...], side: ChessColor) -> int:
+        transforms = self.king_transforms[squares[0]]
+        image = tuple(map(transforms[0].__getitem__, squares))
+        for transform in transforms[1:]:
+            # The white king is on a symmetry axis of the table
+            image = min(image, tuple(map(transform.__getitem__, squares)))
+        index = _SIDE_INDEX[side] * len(self.king_squares) + self.king_slots[image[0]]
+        for square in image[1:]:
+            index = index * 64 + square
+        return index
+
+    def decode(self, index: int) -> tuple[tuple[int, ...], ChessColor]:
+        squares = list()
+        for _ in range(self.num_pieces - 1):
+            index, square = divmod(index, 64)
+            squares.append(square)
+        side_index, slot = divmod(index, len(self.king_squares))
+        squares.append(self.king_squares[slot])
+        return tuple(reversed(squares)), _SIDES[side_index]
+
+    def pieces(self, squares: tuple[int, ...]) -> list[TablePiece]:
+        return list(zip(self.classes, self.colors, squares))
+
+
+@lru_cache(maxsize=None)
+def _get_layout(material: str) -> _Layout:
+    return _Layout(material)
+
+
+def _is_legal(layout: _Layout, squares: tuple[int, ...], side: ChessColor) -> bool:
+    if len(set(squares)) < len(squares):
+        return False
+    for piece_class, square in zip(layout.classes, squares):
+        if piece_class is Pawn and square // 8 in (0, 7):
+            return False
+    pieces = layout.pieces(squares)
+    # The side that just moved can not be in check
+    return not _is_attacked(_king_square(pieces, opponent_color[side]), side, pieces)
+
+
+def _moves(
+    pieces: list[TablePiece], side: ChessColor
+) -> Iterator[tuple[list[TablePiece], bool]]:
+    # Positions after each legal move of side, and whether the move is a
+    # capture or a promotion, which leave the table of the material
+    occupied = 0
+    own = 0
+    for _, color, square in pieces:
+        occupied |= SQUARE_MASKS[square]
+        if color == side:
+            own |= SQUARE_MASKS[square]
+    enemy = occupied & ~own
+
+    for i, (piece_class, color, square) in enumerate(pieces):
+        if color != side:
+            continue
+        if piece_class is Pawn:
+            step = _PAWN_STEPS[side]
+            targets = PAWN_ATTACKS[side][square] & enemy
+            if not occupied & SQUARE_MASKS[square + step]:
+                targets |= SQUARE_MASKS[square + step]
+                if (
+                    square // 8 == _PAWN_INITIAL_ROWS[side]
+                    and not occupied & SQUARE_MASKS[square + 2 * step]
+                ):
+                    targets |= SQUARE_MASKS[square + 2 * step]
+        else:
+            targets = _attacks(piece_class, side, square, occupied) & ~own
+
+        for target in iter_indexes(targets):
+            captures = bool(enemy & SQUARE_MASKS[target])
+            promotes = piece_class is Pawn and target // 8 == _LAST_ROWS[side]
+            for new_class in PROMOTION_CLASSES if promotes else (piece_class,):
+                # The moved piece keeps its place in the list
+                position = [p for p in pieces if p[2] != target]
+                position[position.index(pieces[i])] = (new_class, side, target)
+                king = target if piece_class is King else _king_square(position, side)
+                if not _is_attacked(king, opponent_color[side], position):
+                    yield position, captures or promotes
+
+
+def _unmoves(layout: _Layout, squares: tuple[int, ...], side: ChessColor) -> set[int]:
+    # Indexes of the positions of the table with a move, other than a
+    # capture or a promotion, to the position
+    mover = opponent_color[side]
+    pieces = layout.pieces(squares)
+    occupied = 0
+    for square in squares:
+        occupied |= SQUARE_MASKS[square]
+
+    predecessors = set()
+    for i, (piece_class, color, square) in enumerate(pieces):
+        if color != mover:
+            continue
+        if piece_class is Pawn:
+            # One or two squares back, never to the first row of the pawn
+            step = _PAWN_STEPS[mover]
+            origins = 0
+            origin = square - step
+            if origin // 8 not in (0, 7) and not occupied & SQUARE_MASKS[origin]:
+                origins = SQUARE_MASKS[origin]
+                double_origin = origin - step
+                if (
+                    double_origin // 8 == _PAWN_INITIAL_ROWS[mover]
+                    and not occupied & SQUARE_MASKS[double_origin]
+                ):
+                    origins |= SQUARE_MASKS[double_origin]
+        else:
+            origins = _attacks(piece_class, mover, square, occupied) & ~occupied
+
+        for origin in iter_indexes(origins):
+            previous = squares[:i] + (origin,) + squares[i + 1 :]
+            previous_pieces = layout.pieces(previous)
+            if not _is_attacked(
+                _king_square(previous_pieces, side), mover, previous_pieces
+            ):
+                predecessors.add(layout.index(previous, mover))
+    return predecessors
+
+
+class TablebaseGenerator:
+    """
+    Builds the table of a material, and the tables of the materials its
+    captures and promotions lead to, by retrograde analysis.
+
+    Every legal position is first played forward once: checkmates are lost
+    in 0 plies, moves leaving the table are read from the smaller tables and
+    the moves staying in it are counted. Then positions are resolved by
+    increasing distance to mate, walking back the moves from each of them.
+    A predecessor of a loss in n plies wins in n + 1. A predecessor of a win
+    loses once all its moves are known to lose, in as many plies as its
+    longest defence.
+    """
+
+    def __init__(self) -> None:
+        self.tables: dict[str, bytearray] = dict()
+
+    def generate(self, material: str) -> bytearray:
+        material = canonical_material(material)
+        if material not in self.tables:
+            self.tables[material] = self._generate(material)
+        return self.tables[material]
+
+    def probe(self, pieces: list[TablePiece], side: ChessColor) -> int:
+        if len(pieces) == 2:
+            # Bare kings
+            return 0
+        material, squares, side = _normalize(pieces, side)
+        return self.generate(material)[_get_layout(material).index(squares, side)]
+
+    def _generate(self, material: str) -> bytearray:
+        layout = _get_layout(material)
+        values = bytearray(layout.size)
+        # Moves staying in the table that are not known to lose yet
+        counts = bytearray(layout.size)
+        # Plies to be mated through the longest of the losing moves that
+        # leave the table
+        longest_exits = bytearray(layout.size)
+        draw_exits = bytearray(layout.size)
+        pending: list[list[int]] = [list() for _ in range(MAX_PLIES + 1)]
+
+        for index in range(layout.size):
+            squares, side = layout.decode(index)
+            if layout.index(squares, side) != index or not _is_legal(
+                layout, squares, side
+            ):
+                continue
+
+            children = set()
+            shortest_win = None
+            has_moves = False
+            for position, leaves_table in _moves(layout.pieces(squares), side):
+                has_moves = True
+                if not leaves_table:
+                    children.add(
+                        layout.index(
+                            tuple(s for _, _, s in position), opponent_color[side]
+                        )
+                    )
+                    continue
+                value = self.probe(position, opponent_color[side])
+                if not value:
+                    draw_exits[index] = 1
+                elif value % 2:
+                    # The opponent is mated after value - 1 plies
+                    if shortest_win is None or value < shortest_win:
+                        shortest_win = value
+                else:
+                    longest_exits[index] = max(longest_exits[index], value)
+
+            counts[index] = len(children)
+            if not has_moves:
+                if _is_attacked(
+                    _king_square(layout.pieces(squares), side),
+                    opponent_color[side],
+                    layout.pieces(squares),
+                ):
+                    values[index] = 1
+                    pending[0].append(index)
+            elif shortest_win is not None:
+                values[index] = shortest_win + 1
+                pending[shortest_win].append(index)
+            elif not children and not draw_exits[index]:
+                plies = longest_exits[index]
+                values[index] = plies + 1
+                pending[plies].append(index)
+
+        for plies in range(MAX_PLIES):
+            for index in pending[plies]:
+                if values[index] != plies + 1:
+                    # Found to win sooner by another move
+                    continue
+                squares, side = layout.decode(index)
+                for previous in _unmoves(layout, squares, side):
+                    value = values[previous]
+                    if plies % 2 == 0:
+                        if not value or (value % 2 == 0 and value > plies + 2):
+                            values[previous] = plies + 2
+                            pending[plies + 1].append(previous)
+                    elif not value:
+                        counts[previous] -= 1
+                        if not counts[previous] and not draw_exits[previous]:
+                            loss = max(plies + 1, longest_exits[previous])
+                            if loss > MAX_PLIES:
+                                raise ChessException(
+                                    f"Mates of {material} are too long to store"
+                                )
+                            values[previous] = loss + 1
+                            pending[loss].append(previous)
+        return values
+
+
+def write_tables(directory: str, materials: list[str]):
+    # Writes the tables of materials and of the smaller tables they need
+    generator = TablebaseGenerator()
+    for material in materials:
+        generator.generate(material)
+    os.makedirs(directory, exist_ok=True)
+    for material, values in generator.tables.items():
+        with open(os.path.join(directory, material + TABLE_EXTENSION), "wb") as file:
+            file.write(values)
+
+
+class Outcome(Enum):
+    WIN = "Win"
+    DRAW = "Draw"
+    LOSS = "Loss"
+
+
+class TablebaseResult(NamedTuple):
+    # From the point of view of the side to move, plies is None for draws
+    outcome: Outcome
+    plies: int | None
+
+
+class Tablebase:
+    """
+    Tables of a directory, mapped in memory read only when first probed.
+    A probe sorts at most MAX_PIECES pieces and reads one byte.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.materials = {
+            name[: -len(TABLE_EXTENSION)]
+            for name in os.listdir(directory)
+            if name.endswith(TABLE_EXTENSION)
+        }
+        self.max_pieces = max((len(m) for m in self.materials), default=0)
+        self._tables: dict[str, mmap.mmap] = dict()
+
+    def __reduce__(self):
+        # Other processes map the files again
+        return (Tablebase, (self.directory,))
+
+    def _get_table(self, material: str) -> mmap.mmap | None:
+        if material not in self.materials:
+            return None
+        table = self._tables.get(material, None)
+        if table is None:
+            path = os.path.join(self.directory, material + TABLE_EXTENSION)
+            with open(path, "rb") as file:
+                table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(table) != _get_layout(material).size:
+                table.close()
+                raise ChessException(f"Invalid tablebase {path}")
+            self._tables[material] = table
+        return table
+
+    def probe(self, board: Board) -> TablebaseResult | None:
+        # None when there is no table for the position
+        if board.occupied.bit_count() > self.max_pieces or board.castling_rights:
+            return None
+        side = board.side_to_move
+        en_passant = board.en_passant_position
+        if en_passant is not None and PAWN_ATTACKS[opponent_color[side]][
+            en_passant.index
+        ] & board.get_bitboard(side, Pawn):
+            # Tables do not know en passant captures
+            return None
+        pieces = [(type(p), p.color, p.current_position.index) for p in board.pieces]
+        if len(pieces) == 2:
+            return TablebaseResult(Outcome.DRAW, None)
+
+        material, squares, side = _normalize(pieces, side)
+        table = self._get_table(material)
+        if table is None:
+            return None
+        value = table[_get_layout(material).index(squares, side)]
+        if not value:
+            return TablebaseResult(Outcome.DRAW, None)
+        return TablebaseResult(
+            Outcome.WIN if value % 2 == 0 else Outcome.LOSS, value - 1
+        )
+
+    def close(self):
+        for table in self._tables.values():
+            table.close()
+        self._tables.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory")
+    parser.add_argument("materials", nargs="+")
+    arguments = parser.parse_args()
+    write_tables(arguments.directory, arguments.materials)
@@ -0,0 +1,237 @@
+import struct
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator
+
+from chess.models import POSITIONS, ChessColor, GameStatus, Move
+from chess.pieces import Bishop, Knight, Queen, Rock
+
+COLOR_INDEX = {ChessColor.WHITE: 0, ChessColor.BLACK: 1}
+
+# Rough size of one entry with its lists, its encoded legal moves and its
+# best move, used to turn a memory cap into slots
+ENTRY_SIZE_IN_BYTES = 640
+DEFAULT_MAX_MEMORY_IN_BYTES = 16 * 1024 * 1024
+BUCKET_SIZE = 2
+
+
+class TranspositionEntry:
+    __slots__ = (
+        "key",
+        "last_use",
+        "checkers",
+        "status",
+        "legal_moves",
+        "best_move",
+    )
+
+    def __init__(self, key: int) -> None:
+        self.key = key
+        self.last_use = 0
+        # Results by color (see COLOR_INDEX), None while not computed
+        # Bitboard of the pieces giving check to the king of each color
+        self.checkers: list[int | None] = [None, None]
+        self.status: list[GameStatus | None] = [None, None]
+        # Legal moves of the side to move, see encode_moves
+        self.legal_moves: array | None = None
+        # Best move found by the last search of the position
+        self.best_move = None
+
+
+class TranspositionTable:
+    """
+    Fixed size cache of position results keyed by Board.zobrist_key.
+
+    Slots are grouped in buckets of BUCKET_SIZE entries. A new position takes
+    the least recently used entry of its bucket, so the table never grows
+    past its memory cap. It can be shared by many games.
+    Callers record a hit when the result they looked for was already stored
+    and a miss when they had to compute it.
+    """
+
+    def __init__(self, max_memory: int = DEFAULT_MAX_MEMORY_IN_BYTES) -> None:
+        num_buckets = max(1, max_memory // (ENTRY_SIZE_IN_BYTES * BUCKET_SIZE))
+        # Round down to a power of two, so the bucket is found with a mask
+        num_buckets = 1 << (num_buckets.bit_length() - 1)
+        self.mask = num_buckets - 1
+        self.buckets: list[list[TranspositionEntry | None]] = [
+            [None] * BUCKET_SIZE for _ in range(num_buckets)
+        ]
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.replacements = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self.buckets) * BUCKET_SIZE
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def probe(self, key: int) -> TranspositionEntry | None:
+        self.clock += 1
+        for entry in self.buckets[key & self.mask]:
+            if entry is not None and entry.key == key:
+                entry.last_use = self.clock
+                return entry
+        return None
+
+    def get_entry(self, key: int) -> TranspositionEntry:
+        # Entry of the position, taking a slot for it if it is not stored
+        self.clock += 1
+        bucket = self.buckets[key & self.mask]
+        slot_to_replace = 0
+        for slot, entry in enumerate(bucket):
+            if entry is None:
+                slot_to_replace = slot
+                break
+            if entry.key == key:
+                entry.last_use = self.clock
+                return entry
+            if entry.last_use < bucket[slot_to_replace].last_use:
+                slot_to_replace = slot
+
+        if bucket[slot_to_replace] is not None:
+            self.replacements += 1
+        entry = TranspositionEntry(key)
+        entry.last_use = self.clock
+        bucket[slot_to_replace] = entry
+        return entry
+
+    def probe_best_move(self, key: int) -> Move | None:
+        entry = self.probe(key)
+        return entry.best_move if entry is not None else None
+
+    def store_best_move(self, key: int, move: Move, depth: int):
+        self.get_entry(key).best_move = move
+
+    def record_hit(self):
+        self.hits += 1
+
+    def record_miss(self):
+        self.misses += 1
+
+    def clear(self):
+        for bucket in self.buckets:
+            bucket[:] = [None] * BUCKET_SIZE
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.replacements = 0
+
+
+# An entry of the shared table is the key xor-ed with the data, then the
+# data. Entries are written without locks, a reader that sees the words of
+# two different writes gets a key that does not match and takes it as a miss
+SHARED_ENTRY = struct.Struct("<QQ")
+# Promotion class of a move by its code in the entry, 0 is no promotion
+_PROMOTION_CODES: tuple[type | None, ...] = (None, Queen, Rock, Bishop, Knight)
+
+
+def _encode_entry(move: Move, depth: int) -> int:
+    # Bits 0-5 origin, 6-11 destination, 12-14 promotion, 15 en passant,
+    # 16 castling and 24-31 depth. A stored move is never 0 as its origin
+    # and destination differ
+    return (
+        move.origin.index
+        | move.destination.index << 6
+        | _PROMOTION_CODES.index(move.promotion_class) << 12
+        | move.en_passant << 15
+        | move.castling << 16
+        | depth << 24
+    )
+
+
+def _decode_move(data: int) -> Move:
+    return Move(
+        POSITIONS[data & 63],
+        POSITIONS[(data >> 6) & 63],
+        _PROMOTION_CODES[(data >> 12) & 7],
+        bool(data >> 15 & 1),
+        bool(data >> 16 & 1),
+    )
+
+
+def encode_moves(moves: Iterable[Move]) -> array:
+    # One 32-bit code per move, a tuple of moves takes over ten times more
+    return array("I", (_encode_entry(move, 0) for move in moves))
+
+
+def decode_moves(codes: array) -> Iterator[Move]:
+    return map(_decode_move, codes)
+
+
+class SharedTranspositionTable:
+    """
+    Best moves by position in a block of shared memory, so the workers of a
+    parallel search on other processes learn from each other.
+
+    The process that creates the table owns the memory and unlinks it, the
+    workers attach to it by name, which is what pickling the table sends.
+    Each bucket holds BUCKET_SIZE entries, the first keeps the deepest
+    result and the second always takes the newest one.
+    """
+
+    def __init__(
+        self, max_memory: int = DEFAULT_MAX_MEMORY_IN_BYTES, name: str | None = None
+    ) -> None:
+        bucket_size_in_bytes = SHARED_ENTRY.size * BUCKET_SIZE
+        num_buckets = max(1, max_memory // bucket_size_in_bytes)
+        num_buckets = 1 << (num_buckets.bit_length() - 1)
+        self.max_memory = max_memory
+        self.mask = num_buckets - 1
+        if name is None:
+            self.memory = SharedMemory(
+                create=True, size=num_buckets * bucket_size_in_bytes
+            )
+            self.memory.buf[:] = bytes(self.memory.size)
+        else:
+            self.memory = SharedMemory(name=name)
+        self.owner = name is None
+
+    def __reduce__(self):
+        return (SharedTranspositionTable, (self.max_memory, self.name))
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    @property
+    def capacity(self) -> int:
+        return (self.mask + 1) * BUCKET_SIZE
+
+    def _read(self, offset: int) -> tuple[int, int]:
+        checked_key, data = SHARED_ENTRY.unpack_from(self.memory.buf, offset)
+        return checked_key ^ data, data
+
+    def probe_best_move(self, key: int) -> Move | None:
+        offset = (key & self.mask) * BUCKET_SIZE * SHARED_ENTRY.size
+        for slot in range(BUCKET_SIZE):
+            stored_key, data = self._read(offset + slot * SHARED_ENTRY.size)
+            if stored_key == key and data:
+                return _decode_move(data)
+        return None
+
+    def store_best_move(self, key: int, move: Move, depth: int):
+        offset = (key & self.mask) * BUCKET_SIZE * SHARED_ENTRY.size
+        deepest_key, deepest_data = self._read(offset)
+        if deepest_key == key or depth >= deepest_data >> 24:
+            slot = 0
+        else:
+            slot = 1
+        data = _encode_entry(move, min(depth, 255))
+        SHARED_ENTRY.pack_into(
+            self.memory.buf, offset + slot * SHARED_ENTRY.size, key ^ data, data
+        )
+
+    def clear(self):
+        self.memory.buf[:] = bytes(self.memory.size)
+
+    def close(self):
+        # Unlinks the memory too when called by the process that created it
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
@@ -0,0 +1,24 @@
+from random import Random
+
+from chess.models import ChessColor
+from chess.pieces import PIECE_CLASSES
+
+# Fixed seed, so keys are stable between processes and can be stored
+_random = Random(0x5EED)
+
+
+def _random_key() -> int:
+    return _random.getrandbits(64)
+
+
+PIECE_KEYS: dict[tuple[ChessColor, type], tuple[int, ...]] = {
+    (color, piece_class): tuple(_random_key() for _ in range(64))
+    for color in ChessColor
+    for piece_class in PIECE_CLASSES
+}
+# Xor-ed in when black is to move
+SIDE_KEY: int = _random_key()
+# One key for each of the 16 combinations of castling rights
+CASTLING_KEYS: tuple[int, ...] = tuple(_random_key() for _ in range(16))
+# By column of the en passant square, index 0 is column a
+EN_PASSANT_KEYS: tuple[int, ...] = tuple(_random_key() for _ in range(8))
@@ -0,0 +1,82 @@
+import pytest
+
+from chess.board import Board
+from chess.game import Game
+from chess.models import ChessColor, Move, name_2_position
+from chess.pieces import King, Pawn, Queen, Rock
+
+
+def assert_attack_maps_are_consistent(board: Board):
+    for color in ChessColor:
+        attacked = 0
+        for index in range(64):
+            expected = board.get_attackers(index, color).bit_count()
+            assert board.count_attackers(index, color) == expected
+            if expected:
+                attacked |= 1 << index
+        assert board.get_attacked_squares(color) == attacked
+
+
+def test_attack_maps_follow_make_and_unmake():
+    board = Board()
+    board.initialize_board()
+    assert_attack_maps_are_consistent(board)
+
+    moves = [
+        ("e2", "e4", {}),
+        ("d7", "d5", {}),
+        ("e4", "d5", {}),
+        ("d8", "d5", {}),
+        ("g1", "f3", {}),
+        ("d5", "a2", {}),
+        ("f1", "e2", {}),
+        ("e7", "e5", {}),
+        ("e1", "g1", {"castling": True}),
+    ]
+    for origin, destination, flags in moves:
+        board.make_move(
+            Move(
+                origin=name_2_position(origin),
+                destination=name_2_position(destination),
+                **flags,
+            )
+        )
+        assert_attack_maps_are_consistent(board)
+
+    for _ in moves:
+        board.unmake_move()
+        assert_attack_maps_are_consistent(board)
+
+
+def test_attack_maps_follow_promotion():
+    board = Board()
+    board.initialize_board(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("a1")),
+            Pawn(color=ChessColor.WHITE, current_position=name_2_position("g7")),
+            Rock(color=ChessColor.BLACK, current_position=name_2_position("h8")),
+            Queen(color=ChessColor.BLACK, current_position=name_2_position("b8")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("e8")),
+        ]
+    )
+    board.make_move(
+        Move(origin=name_2_position("g7"), destination=name_2_position("h8"))
+    )
+    assert_attack_maps_are_consistent(board)
+    board.unmake_move()
+    assert_attack_maps_are_consistent(board)
+
+
+def test_square_attack_queries():
+    game = Game()
+    assert game.is_square_attacked("f3", ChessColor.WHITE)
+    assert not game.is_square_attacked("e4", ChessColor.WHITE)
+    assert game.count_attackers("f3", ChessColor.WHITE) == 3
+    assert game.count_attackers("d6", ChessColor.BLACK) == 2
+
+    for origin, destination in [("e2", "e4"), ("f7", "f6"), ("d1", "h5")]:
+        game.make_move(origin, destination)
+
+    assert game.is_square_attacked("e8", ChessColor.WHITE)
+    assert game.verify_if_king_is_in_check(ChessColor.BLACK) == True
+    assert game.threatening_pieces[ChessColor.BLACK] == [game.board.position_map["h5"]]
@@ -0,0 +1,194 @@
+import pytest
+
+from chess.bitboard import (
+    BETWEEN_MASKS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    LINE_MASKS,
+    PAWN_ATTACKS,
+    SQUARE_MASKS,
+    are_aligned,
+    bishop_attacks,
+    bitboard_2_positions,
+    positions_2_bitboard,
+    queen_attacks,
+    rock_attacks,
+)
+from chess.board import Board
+from chess.models import ChessColor, name_2_position
+from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rock
+
+
+def names_2_bitboard(names: list[str]) -> int:
+    return positions_2_bitboard(name_2_position(n) for n in names)
+
+
+def bitboard_2_names(bitboard: int) -> set[str]:
+    return {str(p) for p in bitboard_2_positions(bitboard)}
+
+
+def test_leaper_attacks():
+    assert bitboard_2_names(KNIGHT_ATTACKS[name_2_position("a1").index]) == {
+        "b3",
+        "c2",
+    }
+    assert bitboard_2_names(KING_ATTACKS[name_2_position("h8").index]) == {
+        "g8",
+        "g7",
+        "h7",
+    }
+    assert bitboard_2_names(
+        PAWN_ATTACKS[ChessColor.WHITE][name_2_position("a2").index]
+    ) == {"b3"}
+    assert bitboard_2_names(
+        PAWN_ATTACKS[ChessColor.BLACK][name_2_position("e5").index]
+    ) == {"d4", "f4"}
+
+
+def test_sliding_attacks_stop_at_first_blocker():
+    occupancy = names_2_bitboard(["d6", "b4", "d2", "f6", "g1"])
+    d4 = name_2_position("d4").index
+
+    assert bitboard_2_names(rock_attacks(d4, occupancy)) == {
+        "d5",
+        "d6",
+        "d3",
+        "d2",
+        "c4",
+        "b4",
+        "e4",
+        "f4",
+        "g4",
+        "h4",
+    }
+    assert bitboard_2_names(bishop_attacks(d4, occupancy)) == {
+        "c5",
+        "b6",
+        "a7",
+        "e5",
+        "f6",
+        "c3",
+        "b2",
+        "a1",
+        "e3",
+        "f2",
+        "g1",
+    }
+    assert queen_attacks(d4, occupancy) == rock_attacks(d4, occupancy) | bishop_attacks(
+        d4, occupancy
+    )
+
+
+def test_sliding_attacks_match_piece_positions_on_empty_board():
+    for piece_class in [Bishop, Rock, Queen, King, Knight]:
+        for index in range(64):
+            piece = piece_class(
+                color=ChessColor.WHITE,
+                current_position=bitboard_2_positions(SQUARE_MASKS[index])[0],
+            )
+            assert piece.get_attacks() == positions_2_bitboard(
+                piece.get_possible_positions_to_move()
+            )
+
+
+def test_board_bitboards_follow_moves():
+    board = Board()
+    board.initialize_board()
+    assert board.occupied == names_2_bitboard(
+        [f"{c}{r}" for c in "abcdefgh" for r in [1, 2, 7, 8]]
+    )
+    assert board.get_bitboard(ChessColor.BLACK, Knight) == names_2_bitboard(
+        ["b8", "g8"]
+    )
+
+    board.move("e2", "e4")
+    board.move("d7", "d5")
+    board.move("e4", "d5")
+    assert (
+        board.get_bitboard(ChessColor.WHITE, Pawn)
+        & SQUARE_MASKS[name_2_position("d5").index]
+    )
+    assert (
+        not board.color_bitboards[ChessColor.BLACK]
+        & SQUARE_MASKS[name_2_position("d5").index]
+    )
+    assert bitboard_2_names(board.color_bitboards[ChessColor.BLACK]) == {
+        f"{c}{r}" for c in "abcdefgh" for r in [7, 8]
+    } - {"d7"}
+
+
+def test_board_bitboards_follow_promotion():
+    board = Board()
+    board.initialize_board(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("a1")),
+            Pawn(color=ChessColor.WHITE, current_position=name_2_position("b7")),
+            Rock(color=ChessColor.BLACK, current_position=name_2_position("c8")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("h8")),
+        ]
+    )
+    board.move("b7", "c8", promotion_class=Knight)
+
+    assert board.get_bitboard(ChessColor.WHITE, Knight) == names_2_bitboard(["c8"])
+    assert board.get_bitboard(ChessColor.WHITE, Pawn) == 0
+    assert board.get_bitboard(ChessColor.BLACK, Rock) == 0
+    assert board.occupied == names_2_bitboard(["a1", "c8", "h8"])
+
+
+def test_get_attackers():
+    board = Board()
+    board.initialize_board(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            Rock(color=ChessColor.WHITE, current_position=name_2_position("e2")),
+            Knight(color=ChessColor.BLACK, current_position=name_2_position("d3")),
+            Queen(color=ChessColor.BLACK, current_position=name_2_position("e8")),
+            Bishop(color=ChessColor.BLACK, current_position=name_2_position("a5")),
+            Pawn(color=ChessColor.BLACK, current_position=name_2_position("f2")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("h8")),
+        ]
+    )
+    e1 = name_2_position("e1").index
+
+    # The queen is blocked by the rock and the bishop by nothing
+    assert bitboard_2_names(board.get_attackers(e1, ChessColor.BLACK)) == {
+        "d3",
+        "a5",
+        "f2",
+    }
+    assert board.get_attackers(e1, ChessColor.WHITE) == names_2_bitboard(["e2"])
+    assert board.get_attackers(name_2_position("e5").index, ChessColor.WHITE) == (
+        names_2_bitboard(["e2"])
+    )
+
+
+@pytest.mark.parametrize(
+    "origin,destination,between",
+    [
+        ("c4", "f7", ["d5", "e6"]),
+        ("f7", "c4", ["d5", "e6"]),
+        ("a1", "a8", ["a2", "a3", "a4", "a5", "a6", "a7"]),
+        ("h4", "c4", ["g4", "f4", "e4", "d4"]),
+        ("e4", "e5", []),
+    ],
+)
+def test_between_masks(origin, destination, between):
+    o = name_2_position(origin).index
+    d = name_2_position(destination).index
+
+    assert BETWEEN_MASKS[o][d] == names_2_bitboard(between)
+    assert are_aligned(o, d)
+    assert LINE_MASKS[o][d] == LINE_MASKS[d][o]
+    assert LINE_MASKS[o][d] & SQUARE_MASKS[o] and LINE_MASKS[o][d] & SQUARE_MASKS[d]
+
+
+def test_squares_out_of_line():
+    b1 = name_2_position("b1").index
+    c3 = name_2_position("c3").index
+
+    assert not are_aligned(b1, c3)
+    assert BETWEEN_MASKS[b1][c3] == 0
+    assert LINE_MASKS[b1][b1] == 0
+    assert LINE_MASKS[0][63] == names_2_bitboard(
+        ["a1", "b2", "c3", "d4", "e5", "f6", "g7", "h8"]
+    )
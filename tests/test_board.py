@@ -1,7 +1,7 @@
 import pytest
 
 from chess.board import Board
-from chess.models import ChessColor
+from chess.models import ChessColor, Move, name_2_position
 from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rock
 
 
@@ -55,3 +55,67 @@ def test_color_of_pieces_at_board_after_initialization():
 
     for pos, color in right_colors_map.items():
         assert board.position_map[pos].color == color
+
+
+def test_get_pieces_by_color_and_type():
+    board = Board()
+    board.initialize_board()
+
+    assert len(board.get_pieces(ChessColor.WHITE)) == 16
+    assert len(board.get_pieces(ChessColor.BLACK, Pawn)) == 8
+    black_knights = board.get_pieces(ChessColor.BLACK, Knight)
+    assert sorted(str(p.current_position) for p in black_knights) == ["b8", "g8"]
+    assert all(p.color == ChessColor.BLACK for p in board.get_pieces(ChessColor.BLACK))
+
+
+def test_piece_indexes_follow_captures_and_promotions():
+    board = Board()
+    board.initialize_board(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            white_pawn := Pawn(
+                color=ChessColor.WHITE, current_position=name_2_position("g7")
+            ),
+            King(color=ChessColor.BLACK, current_position=name_2_position("e8")),
+            black_rock := Rock(
+                color=ChessColor.BLACK, current_position=name_2_position("h8")
+            ),
+            Knight(color=ChessColor.BLACK, current_position=name_2_position("a5")),
+        ]
+    )
+
+    board.move("g7", "h8", promotion_class=Queen)
+    white_queen = board.position_map["h8"]
+    assert board.get_pieces(ChessColor.WHITE, Pawn) == []
+    assert board.get_pieces(ChessColor.WHITE, Queen) == [white_queen]
+    assert board.get_pieces(ChessColor.BLACK, Rock) == []
+    assert len(board.get_pieces(ChessColor.BLACK)) == 2
+    assert len(board.pieces) == 4
+    assert white_pawn not in board.pieces and black_rock not in board.pieces
+
+    board = Board()
+    board.initialize_board()
+    board.make_move(
+        Move(origin=name_2_position("b1"), destination=name_2_position("c3"))
+    )
+    board.unmake_move()
+    assert len(board.get_pieces(ChessColor.WHITE, Knight)) == 2
+
+
+def test_check_queries_on_board():
+    board = Board()
+    board.initialize_board(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            Knight(color=ChessColor.BLACK, current_position=name_2_position("d3")),
+            Rock(color=ChessColor.BLACK, current_position=name_2_position("e7")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("h8")),
+        ]
+    )
+
+    assert board.is_in_check(ChessColor.WHITE) == True
+    assert board.is_in_check(ChessColor.BLACK) == False
+    assert board.get_checkers(ChessColor.WHITE) == board.get_bitboard(
+        ChessColor.BLACK, Knight
+    ) | board.get_bitboard(ChessColor.BLACK, Rock)
+    assert board.get_checkers(ChessColor.BLACK) == 0
@@ -0,0 +1,66 @@
+import pytest
+
+from chess.book import BOOK_ENTRY, OpeningBook, write_book
+from chess.engine import Engine
+from chess.game import Game
+from chess.models import ChessException
+
+LINES = [
+    "e2e4 e7e5 g1f3 b8c6",
+    "e2e4 c7c5",
+    "d2d4 d7d5 c2c4",
+    "e2e4 e7e5 f1c4",
+]
+
+
+@pytest.fixture
+def book(tmp_path):
+    path = tmp_path / "book.bin"
+    write_book(str(path), LINES)
+    book = OpeningBook(str(path))
+    yield book
+    book.close()
+
+
+def test_book_moves_by_weight(book):
+    # One entry by distinct move of each position
+    assert len(book) == 9
+
+    game = Game(opening_book=book)
+    assert [(repr(m), w) for m, w in game.book_moves()] == [
+        ("e2e4", 3),
+        ("d2d4", 1),
+    ]
+
+    game.make_move("e2", "e4")
+    assert [(repr(m), w) for m, w in game.book_moves()] == [
+        ("e7e5", 2),
+        ("c7c5", 1),
+    ]
+
+    game.make_move("a7", "a6")
+    assert game.book_moves() == []
+    assert Game().book_moves() == []
+
+
+def test_engine_plays_book_moves(book):
+    game = Game(opening_book=book)
+    engine = Engine(game, max_time=0.1)
+
+    result = engine.play()
+    assert repr(result.best_move) in ("e2e4", "d2d4") and result.nodes == 0
+    assert not engine.is_pondering
+
+
+def test_invalid_books(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    book = OpeningBook(str(path))
+    assert len(book) == 0 and Game(opening_book=book).book_moves() == []
+
+    path.write_bytes(b"\0" * (BOOK_ENTRY.size + 1))
+    with pytest.raises(ChessException):
+        OpeningBook(str(path))
+
+    with pytest.raises(ChessException):
+        write_book(str(path), ["e2e5"])
@@ -1,7 +1,8 @@
 import pytest
 
+from chess.board import Board
 from chess.game import Game
-from chess.models import ChessColor, name_2_position
+from chess.models import ChessColor, ChessException, GameStatus, name_2_position
 from chess.pieces import Bishop, King, Queen, Knight, Pawn, Rock
 
 
@@ -174,3 +175,82 @@ def test_check_mate_07():
     assert game.verify_check_mate(king_color=ChessColor.BLACK) == True
     assert len(game.threatening_pieces[ChessColor.BLACK]) == 2
 
+
+def test_validate_move_leaves_board_untouched():
+    game = Game(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            Rock(color=ChessColor.WHITE, current_position=name_2_position("e2")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("e8")),
+            Queen(color=ChessColor.BLACK, current_position=name_2_position("e5")),
+        ]
+    )
+
+    with pytest.raises(ChessException):
+        game.validate_move("e2", "d2")  # Rock is pinned
+    game.validate_move("e2", "e5")
+
+    assert str(game.board.position_map["e2"].current_position) == "e2"
+    assert isinstance(game.board.position_map["e5"], Queen)
+    assert len(game.board.pieces) == 4
+    assert len(game.board.history) == 0
+    assert len(game.threatening_pieces[ChessColor.WHITE]) == 0
+
+
+def test_status_after_fools_mate():
+    game = Game()
+    for origin, destination in [("f2", "f3"), ("e7", "e5"), ("g2", "g4")]:
+        game.make_move(origin, destination)
+        assert game.status == GameStatus.ONGOING
+
+    game.make_move("d8", "h4")
+    assert game.status == GameStatus.CHECKMATE
+    assert game.verify_check_mate(king_color=ChessColor.WHITE) == True
+    assert game.threatening_pieces[ChessColor.WHITE] == [game.board.position_map["h4"]]
+
+
+def test_stalemate():
+    game = Game(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("f7")),
+            Queen(color=ChessColor.WHITE, current_position=name_2_position("g5")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("h8")),
+        ]
+    )
+
+    game.make_move("g5", "g6")
+    assert game.status == GameStatus.STALEMATE
+    assert game.get_status(ChessColor.WHITE) == GameStatus.ONGOING
+    assert game.verify_check_mate(king_color=ChessColor.BLACK) == False
+
+
+def test_check_on_another_board_does_not_touch_the_game():
+    game = Game()
+    board = Board()
+    board.initialize_board(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            Queen(color=ChessColor.BLACK, current_position=name_2_position("e5")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("e8")),
+        ]
+    )
+
+    assert game.verify_if_king_is_in_check(ChessColor.WHITE, board=board) == True
+    assert game.threatening_pieces[ChessColor.WHITE] == []
+    assert game.verify_if_king_is_in_check(ChessColor.WHITE) == False
+
+
+def test_threatening_pieces_of_an_older_position_are_dropped():
+    game = Game()
+    for origin, destination in [("e2", "e4"), ("f7", "f6"), ("d1", "h5")]:
+        game.make_move(origin, destination)
+    assert game.threatening_pieces[ChessColor.BLACK] == [game.board.position_map["h5"]]
+
+    game.make_move("g7", "g6")
+    game.make_move("h5", "g6")
+    assert game.threatening_pieces[ChessColor.BLACK] == [game.board.position_map["g6"]]
+
+    # The pawn takes the checking queen, no piece of its own is a checker
+    game.make_move("h7", "g6")
+    assert game.threatening_pieces[ChessColor.BLACK] == []
+    assert game.verify_if_king_is_in_check(ChessColor.BLACK) == False
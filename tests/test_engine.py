@@ -0,0 +1,74 @@
+import threading
+import time
+
+from chess.engine import Engine
+from chess.game import Game
+from chess.models import ChessColor, GameStatus, Move, name_2_position
+from chess.pieces import Knight
+from chess.search import Search
+
+
+def new_move(origin: str, destination: str, **kwargs) -> Move:
+    return Move(name_2_position(origin), name_2_position(destination), **kwargs)
+
+
+def test_play_move_of_a_search():
+    game = Game(fen="r3k3/8/8/8/3pP3/8/8/R3K2R b KQq e3 0 1")
+    game.play_move(new_move("d4", "e3", en_passant=True))
+    assert game.board.position_map.get("e4") is None
+
+    game.play_move(new_move("e1", "g1", castling=True))
+    assert game.kings_position[ChessColor.WHITE] == "g1"
+    assert str(game.board.position_map["f1"].current_position) == "f1"
+
+    game = Game(fen="4k3/1P6/8/8/8/8/8/4K3 w - - 0 1")
+    game.play_move(new_move("b7", "b8", promotion_class=Knight))
+    assert isinstance(game.board.position_map["b8"], Knight)
+
+
+def test_stop_from_another_thread():
+    game = Game()
+    fen = game.fen()
+    search = Search(game)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(search.search()))
+    thread.start()
+    time.sleep(0.2)
+    search.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert game.fen() == fen and not game.board.history
+
+
+def test_pondering_on_the_expected_reply():
+    game = Game()
+    engine = Engine(game, max_time=0.2)
+
+    result = engine.play()
+    assert engine.is_pondering
+    expected_reply = result.principal_variation[1]
+
+    time.sleep(0.2)
+    game.play_move(expected_reply)
+    fen = game.fen()
+    result = engine.think()
+
+    assert engine.ponder_hits == 1 and not engine.is_pondering
+    assert result.best_move in list(game.legal_moves())
+    assert game.fen() == fen
+
+
+def test_pondering_miss_searches_again():
+    game = Game()
+    engine = Engine(game, max_time=0.2)
+    result = engine.play()
+
+    reply = next(m for m in game.legal_moves() if m != result.principal_variation[1])
+    game.play_move(reply)
+    result = engine.play()
+
+    assert engine.ponder_hits == 0
+    assert len(game.board.history) == 3 and game.status == GameStatus.ONGOING
+    engine.stop_pondering()
+    assert not engine.is_pondering
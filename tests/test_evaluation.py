@@ -0,0 +1,46 @@
+from benchmarks.perft import REFERENCE_POSITIONS
+from chess.board import Board
+from chess.evaluation import evaluate
+from chess.game import Game
+from chess.move_generator import generate_legal_moves
+from chess.piece_square import MAX_PHASE
+
+
+def walk(board: Board, depth: int):
+    # Checks the incremental scores against a full recount at every node
+    assert (
+        board.midgame_score,
+        board.endgame_score,
+        board.phase,
+    ) == board.compute_piece_square_scores()
+    if depth == 0:
+        return
+    for move in list(generate_legal_moves(board)):
+        board.make_move(move)
+        walk(board, depth - 1)
+        board.unmake_move()
+
+
+def test_incremental_scores_match_a_full_recount():
+    for _, fen, _ in REFERENCE_POSITIONS:
+        walk(Game(fen=fen).board, 2)
+
+
+def test_scores_of_the_initial_position():
+    board = Game().board
+    assert board.midgame_score == board.endgame_score == 0
+    assert board.phase == MAX_PHASE
+
+    board.move("e2", "e4")
+    # Black to move, white has a better center pawn
+    assert evaluate(board) < 0
+
+
+def test_king_centralization_counts_in_the_endgame():
+    centralized = Game(fen="8/8/8/3k4/8/8/8/K7 w - - 0 1").board
+    assert centralized.phase == 0
+    assert evaluate(centralized) < -50
+
+    midgame = Game(fen="r1bqkbnr/8/8/8/3K4/8/8/R1BQ1BNR w - - 0 1").board
+    opposite = Game(fen="r1bqkbnr/8/8/8/8/8/8/R1BQKBNR w - - 0 1").board
+    assert evaluate(midgame) < evaluate(opposite)
@@ -0,0 +1,50 @@
+from chess.exchange import static_exchange_evaluation
+from chess.game import Game
+from chess.models import Move, name_2_position
+from chess.move_generator import generate_legal_captures
+from chess.pieces import Queen
+
+
+def new_move(origin: str, destination: str, **kwargs) -> Move:
+    return Move(name_2_position(origin), name_2_position(destination), **kwargs)
+
+
+def test_undefended_pawn():
+    game = Game(fen="1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1")
+    assert static_exchange_evaluation(game.board, new_move("e1", "e5")) == 100
+
+
+def test_exchange_with_sliders_behind():
+    game = Game(fen="1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1")
+    # Nxe5 Nxe5 Rxe5 Bxe5 Qxe5 Rxe5 leaves white a knight down for a pawn
+    assert static_exchange_evaluation(game.board, new_move("d3", "e5")) == -220
+
+
+def test_side_stops_when_taking_back_loses():
+    game = Game(fen="4k3/8/3p4/4p3/8/8/8/4QK2 w - - 0 1")
+    assert static_exchange_evaluation(game.board, new_move("e1", "e5")) == -800
+
+    game = Game(fen="4k3/8/3q4/4p3/3P4/8/8/4K3 w - - 0 1")
+    # The queen takes back a pawn that nothing defends
+    assert static_exchange_evaluation(game.board, new_move("d4", "e5")) == 0
+
+
+def test_en_passant_and_promotion():
+    game = Game(fen="4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+    move = new_move("e5", "d6", en_passant=True)
+    assert static_exchange_evaluation(game.board, move) == 100
+
+    game = Game(fen="1r2k3/P7/8/8/8/8/8/4K3 w - - 0 1")
+    promotion = new_move("a7", "a8", promotion_class=Queen)
+    assert static_exchange_evaluation(game.board, promotion) == 800 - 900
+    capture = new_move("a7", "b8", promotion_class=Queen)
+    assert static_exchange_evaluation(game.board, capture) == 500 + 800
+
+
+def test_legal_captures():
+    game = Game(fen="1r2k3/P7/8/3pP3/8/8/8/4K2R w K d6 0 1")
+
+    captures = {repr(m) for m in generate_legal_captures(game.board)}
+    assert captures == {"e5d6"} | {
+        f"a7{square}{letter}" for square in ("a8", "b8") for letter in "qrbn"
+    }
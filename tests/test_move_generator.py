@@ -0,0 +1,220 @@
+import pytest
+
+from chess.board import Board
+from chess.game import Game
+from chess.models import (
+    ChessColor,
+    ChessException,
+    GameStatus,
+    Move,
+    name_2_position,
+)
+from chess.move_generator import (
+    MoveLegality,
+    check_move,
+    count_legal_moves,
+    generate_legal_moves,
+    get_move_restrictions,
+)
+from chess.pieces import Bishop, King, Pawn, Queen, Rock
+
+
+def perft(board: Board, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in list(generate_legal_moves(board)):
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def new_move(origin: str, destination: str, **kwargs) -> Move:
+    return Move(name_2_position(origin), name_2_position(destination), **kwargs)
+
+
+def test_legal_moves_from_initial_position():
+    board = Board()
+    board.initialize_board()
+
+    assert len(list(generate_legal_moves(board))) == 20
+    assert perft(board, 3) == 8902
+
+
+def test_pinned_piece_only_moves_along_the_pin():
+    board = Board()
+    board.initialize_board(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            Rock(color=ChessColor.WHITE, current_position=name_2_position("e2")),
+            Bishop(color=ChessColor.WHITE, current_position=name_2_position("d2")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("h8")),
+            Queen(color=ChessColor.BLACK, current_position=name_2_position("e5")),
+            Bishop(color=ChessColor.BLACK, current_position=name_2_position("a5")),
+        ]
+    )
+
+    restrictions = get_move_restrictions(board, ChessColor.WHITE)
+    assert set(restrictions.pins) == {12, 11}
+    assert restrictions.checkers == 0
+
+    moves = {repr(m) for m in generate_legal_moves(board)}
+    assert {"e2e3", "e2e4", "e2e5", "d2c3", "d2b4", "d2a5"} <= moves
+    assert "e2d2" not in moves and "d2e3" not in moves
+    assert check_move(board, new_move("e2", "f2")) == MoveLegality.KING_IN_CHECK
+    assert check_move(board, new_move("e2", "f3")) == MoveLegality.NOT_ALLOWED
+
+
+def test_only_evasions_are_generated_in_check():
+    board = Board()
+    board.initialize_board(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            Rock(color=ChessColor.WHITE, current_position=name_2_position("a3")),
+            Pawn(color=ChessColor.WHITE, current_position=name_2_position("d2")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("h8")),
+            Rock(color=ChessColor.BLACK, current_position=name_2_position("e8")),
+        ]
+    )
+
+    moves = {repr(m) for m in generate_legal_moves(board)}
+    # The rock blocks the e file or the king steps off it, e2 is still attacked
+    assert moves == {"a3e3", "e1d1", "e1f1", "e1f2"}
+
+
+def test_double_check_leaves_only_king_moves():
+    board = Board()
+    board.initialize_board(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            Queen(color=ChessColor.WHITE, current_position=name_2_position("a4")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("h8")),
+            Rock(color=ChessColor.BLACK, current_position=name_2_position("e8")),
+            Bishop(color=ChessColor.BLACK, current_position=name_2_position("b4")),
+        ]
+    )
+
+    moves = {repr(m) for m in generate_legal_moves(board)}
+    assert moves == {"e1d1", "e1f1", "e1f2"}
+
+
+def test_castling_through_attacked_square_is_rejected():
+    game = Game(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            Rock(color=ChessColor.WHITE, current_position=name_2_position("h1")),
+            Rock(color=ChessColor.WHITE, current_position=name_2_position("a1")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("e8")),
+            Rock(color=ChessColor.BLACK, current_position=name_2_position("f8")),
+        ]
+    )
+
+    moves = {repr(m) for m in generate_legal_moves(game.board)}
+    assert "e1c1" in moves and "e1g1" not in moves
+    with pytest.raises(ChessException, match="would put the white king in check"):
+        game.validate_move("e1", "g1", castling=True, rock_position="h1")
+
+    game.make_move("e1", "c1", castling=True, rock_position="a1")
+    assert str(game.board.position_map["d1"]) == "Rock at d1"
+
+
+def test_en_passant_exposing_the_king_is_rejected():
+    game = Game(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("a5")),
+            Pawn(color=ChessColor.WHITE, current_position=name_2_position("d5")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("e8")),
+            Pawn(color=ChessColor.BLACK, current_position=name_2_position("e7")),
+            Rock(color=ChessColor.BLACK, current_position=name_2_position("h5")),
+        ]
+    )
+    game.make_move("e7", "e5")
+
+    moves = {repr(m) for m in generate_legal_moves(game.board, ChessColor.WHITE)}
+    assert "d5e6" not in moves and "d5d6" in moves
+    with pytest.raises(ChessException, match="would put the white king in check"):
+        game.validate_move("d5", "e6", en_passant=True, enemy_pawn_position="e5")
+
+
+def test_en_passant_is_only_open_to_the_side_to_move():
+    game = Game()
+    game.make_move("e2", "e4")
+
+    moves = list(generate_legal_moves(game.board, ChessColor.WHITE))
+    assert not [m for m in moves if m.en_passant]
+    assert len(moves) == 30
+
+
+def test_stale_en_passant_is_rejected():
+    game = Game()
+    for origin, destination in [("e2", "e4"), ("a7", "a6"), ("e4", "e5")]:
+        game.make_move(origin, destination)
+    game.make_move("d7", "d5")
+    game.validate_move("e5", "d6", en_passant=True, enemy_pawn_position="d5")
+
+    game.make_move("h2", "h3")
+    game.make_move("h7", "h6")
+    assert not [m for m in game.legal_moves() if m.en_passant]
+    with pytest.raises(ChessException, match="This move is not allowed"):
+        game.make_move("e5", "d6", en_passant=True, enemy_pawn_position="d5")
+    assert isinstance(game.board.position_map["d5"], Pawn)
+
+
+def test_pawn_cannot_capture_forward():
+    game = Game(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            Pawn(color=ChessColor.WHITE, current_position=name_2_position("e4")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("e8")),
+            Pawn(color=ChessColor.BLACK, current_position=name_2_position("e5")),
+        ]
+    )
+
+    with pytest.raises(ChessException, match="This move is not allowed"):
+        game.validate_move("e4", "e5")
+
+
+def test_game_legal_moves_cover_special_moves():
+    game = Game(
+        pieces=[
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            Rock(color=ChessColor.WHITE, current_position=name_2_position("h1")),
+            Pawn(color=ChessColor.WHITE, current_position=name_2_position("b7")),
+            Pawn(color=ChessColor.WHITE, current_position=name_2_position("e5")),
+            King(color=ChessColor.BLACK, current_position=name_2_position("f8")),
+            Rock(color=ChessColor.BLACK, current_position=name_2_position("a8")),
+            Pawn(color=ChessColor.BLACK, current_position=name_2_position("d7")),
+        ]
+    )
+    game.make_move("d7", "d5")
+
+    moves = list(game.legal_moves(ChessColor.WHITE))
+    assert [m for m in moves if m.castling] == [new_move("e1", "g1", castling=True)]
+    assert [m for m in moves if m.en_passant] == [new_move("e5", "d6", en_passant=True)]
+    promotions = [m for m in moves if m.promotion_class is not None]
+    assert len(promotions) == 8
+    assert {repr(m) for m in promotions} == {
+        f"b7{square}{letter}" for square in ("a8", "b8") for letter in "qrbn"
+    }
+    assert game.count_legal_moves(ChessColor.WHITE) == len(moves)
+
+
+def test_count_legal_moves_matches_generated_moves():
+    board = Board()
+    board.initialize_board()
+    for name in ["e2e4", "d7d5", "e4d5", "d8d5", "b1c3", "d5e5"]:
+        moves = {repr(m): m for m in generate_legal_moves(board)}
+        board.make_move(moves[name])
+        assert count_legal_moves(board) == len(list(generate_legal_moves(board)))
+
+
+def test_counts_of_the_side_that_just_moved():
+    game = Game()
+    game.make_move("e2", "e4")
+
+    assert game.count_legal_moves(ChessColor.WHITE) == 30
+    assert game.count_legal_moves(ChessColor.WHITE) == len(
+        list(game.legal_moves(ChessColor.WHITE))
+    )
+    assert game.get_status(ChessColor.WHITE) == GameStatus.ONGOING
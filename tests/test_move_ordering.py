@@ -0,0 +1,45 @@
+from benchmarks.perft import REFERENCE_POSITIONS
+from chess.game import Game
+from chess.models import Move, name_2_position
+from chess.move_ordering import MoveOrdering
+from chess.search import Search
+
+
+def new_move(origin: str, destination: str) -> Move:
+    return Move(name_2_position(origin), name_2_position(destination))
+
+
+def test_captures_by_most_valuable_victim_and_least_valuable_attacker():
+    game = Game(fen="4k3/8/2r1q3/3P4/8/8/8/4RK2 w - - 0 1")
+    moves = list(game.legal_moves())
+
+    ordered = MoveOrdering().order(game.board, moves, 0)
+    assert [repr(m) for m in ordered[:3]] == ["d5e6", "e1e6", "d5c6"]
+
+
+def test_hash_move_killers_and_history():
+    game = Game()
+    ordering = MoveOrdering()
+    board = game.board
+
+    ordering.record_cutoff(board, new_move("g1", "f3"), ply=0, depth=3)
+    ordering.record_cutoff(board, new_move("b1", "c3"), ply=0, depth=2)
+    ordering.record_cutoff(board, new_move("d2", "d4"), ply=1, depth=4)
+
+    ordered = ordering.order(board, list(game.legal_moves()), 0, new_move("e2", "e4"))
+    assert [repr(m) for m in ordered[:4]] == ["e2e4", "b1c3", "g1f3", "d2d4"]
+    assert ordering.killers[0] == [new_move("b1", "c3"), new_move("g1", "f3")]
+
+    ordering.clear()
+    assert ordering.killers[0] == [None, None]
+
+
+def test_ordering_keeps_the_search_score():
+    for _, fen, _ in REFERENCE_POSITIONS[:3]:
+        searches = [
+            Search(Game(fen=fen), move_ordering=o, quiescence=False)
+            for o in (False, True)
+        ]
+        unordered, ordered = [s.search(max_depth=3) for s in searches]
+
+        assert ordered.score == unordered.score
@@ -1,7 +1,7 @@
 import pytest
 
 from chess.board import Board
-from chess.models import ChessColor, coordinates_2_position, name_2_position
+from chess.models import ChessColor, Move, coordinates_2_position, name_2_position
 from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rock
 
 
@@ -368,3 +368,109 @@ def test_promotion_01():
     assert white_pawn not in board.pieces
     assert promoted_piece in board.pieces
 
+
+def board_snapshot(board: Board):
+    return (
+        {
+            pos: (type(p), p.color, p.num_movements)
+            for pos, p in board.position_map.items()
+        },
+        sorted(str(p.current_position) for p in board.pieces),
+        {c: len(pieces) for c, pieces in board.captured_pieces.items()},
+        dict(board.kings_position),
+        dict(board.color_bitboards),
+        dict(board.type_bitboards),
+    )
+
+
+def test_make_and_unmake_capture():
+    board = Board()
+    board.initialize_board()
+    board.move("e2", "e4")
+    board.move("d7", "d5")
+    before = board_snapshot(board)
+
+    piece, captured_piece = board.make_move(
+        Move(origin=name_2_position("e4"), destination=name_2_position("d5"))
+    )
+    assert isinstance(captured_piece, Pawn)
+    assert captured_piece not in board.pieces
+    assert board.position_map["d5"] is piece
+
+    board.unmake_move()
+    assert board_snapshot(board) == before
+    assert board.position_map["d5"] is captured_piece
+    assert len(board.history) == 0
+
+
+def test_make_and_unmake_promotion():
+    board = Board()
+    board.initialize_board(
+        pieces=[
+            white_pawn := Pawn(
+                color=ChessColor.WHITE, current_position=name_2_position("b7")
+            ),
+            King(color=ChessColor.WHITE, current_position=name_2_position("e1")),
+            black_rock := Rock(
+                color=ChessColor.BLACK, current_position=name_2_position("a8")
+            ),
+            King(color=ChessColor.BLACK, current_position=name_2_position("h8")),
+        ]
+    )
+    before = board_snapshot(board)
+
+    board.make_move(
+        Move(
+            origin=name_2_position("b7"),
+            destination=name_2_position("a8"),
+            promotion_class=Knight,
+        )
+    )
+    assert isinstance(board.position_map["a8"], Knight)
+    assert white_pawn not in board.pieces
+    assert black_rock not in board.pieces
+
+    board.unmake_move()
+    assert board_snapshot(board) == before
+    assert board.position_map["b7"] is white_pawn
+    assert board.position_map["a8"] is black_rock
+
+
+def test_make_and_unmake_castling_and_en_passant():
+    board = Board()
+    board.initialize_board()
+    for origin, destination in [("g1", "f3"), ("g2", "g3"), ("f1", "g2")]:
+        board.move(origin, destination)
+    before = board_snapshot(board)
+
+    board.make_move(
+        Move(
+            origin=name_2_position("e1"),
+            destination=name_2_position("g1"),
+            castling=True,
+        )
+    )
+    assert isinstance(board.position_map["g1"], King)
+    assert isinstance(board.position_map["f1"], Rock)
+    assert board.kings_position[ChessColor.WHITE] == "g1"
+
+    board.unmake_move()
+    assert board_snapshot(board) == before
+    assert board.kings_position[ChessColor.WHITE] == "e1"
+
+    for origin, destination in [("e2", "e4"), ("e4", "e5"), ("d7", "d5")]:
+        board.move(origin, destination)
+    before = board_snapshot(board)
+
+    board.make_move(
+        Move(
+            origin=name_2_position("e5"),
+            destination=name_2_position("d6"),
+            en_passant=True,
+        )
+    )
+    assert "d5" not in board.position_map
+    assert len(board.captured_pieces[ChessColor.BLACK]) == 1
+
+    board.unmake_move()
+    assert board_snapshot(board) == before
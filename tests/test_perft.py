@@ -0,0 +1,65 @@
+import pytest
+
+from benchmarks.perft import REFERENCE_POSITIONS
+from chess.board import Board
+from chess.fen import INITIAL_FEN
+from chess.game import Game
+from chess.models import ChessColor, ChessException
+
+
+@pytest.mark.parametrize("name,fen,expected_counts", REFERENCE_POSITIONS)
+def test_perft_of_reference_positions(name, fen, expected_counts):
+    game = Game(fen=fen)
+
+    assert [game.perft(depth) for depth in (1, 2)] == expected_counts[:2]
+    assert game.fen().split()[:4] == fen.split()[:4]
+
+
+def test_perft_divide_adds_up_to_perft():
+    game = Game(fen=REFERENCE_POSITIONS[1][1])
+    divide = game.perft_divide(2)
+
+    assert len(divide) == 48
+    assert divide["e1g1"] == 43
+    assert sum(divide.values()) == game.perft(2)
+
+
+def test_fen_of_initial_position():
+    game = Game()
+    assert game.fen() == INITIAL_FEN
+
+    game.make_move("e2", "e4")
+    assert game.fen() == ("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1")
+    assert Game(fen=game.fen()).board.zobrist_key == game.board.zobrist_key
+
+
+def test_fen_sets_side_castling_and_en_passant():
+    game = Game(fen="r3k2r/8/8/3pP3/8/8/8/R3K2R w Kq d6 0 1")
+
+    assert game.board.side_to_move == ChessColor.WHITE
+    assert game.board.castling_rights == 1 | 8
+    assert str(game.board.en_passant_position) == "d6"
+    moves = {repr(m) for m in game.legal_moves()}
+    assert {"e5d6", "e1g1"} <= moves and "e1c1" not in moves
+
+
+def test_board_from_fen_holds_only_its_pieces():
+    fen = "4k3/8/8/8/8/8/8/4K3 w - - 0 1"
+    board = Board.from_fen(fen)
+
+    assert len(board.pieces) == len(board.position_map) == 2
+    assert board.fen() == fen
+    assert board.zobrist_key == board.compute_zobrist_key()
+
+
+def test_invalid_fen():
+    with pytest.raises(ChessException):
+        Game(fen="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1")
+
+
+def test_parallel_perft_matches_serial_perft():
+    game = Game(fen=REFERENCE_POSITIONS[1][1])
+
+    assert game.perft_divide(2, max_workers=2) == game.perft_divide(2)
+    assert game.perft(3, max_workers=2) == 97862
+    assert game.fen() == REFERENCE_POSITIONS[1][1]
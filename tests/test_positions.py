@@ -1,6 +1,21 @@
+from copy import deepcopy
+
 import pytest
 
-from chess.models import ChessColor, LetterPosition, NumberPosition, Position
+from chess.bitboard import bitboard_2_positions, positions_2_bitboard
+from chess.models import (
+    NEIGHBOURS,
+    POSITIONS,
+    RAYS,
+    ChessColor,
+    Direction,
+    LetterPosition,
+    NumberPosition,
+    Position,
+    coordinates_2_position,
+    index_2_position,
+    name_2_position,
+)
 from chess.pieces import Bishop, King, Knight, Pawn, Queen, Rock
 
 
@@ -89,3 +104,55 @@ def test_get_positions_of_pieces():
 
         for expected in expected_coordinates:
             assert expected in coordinates
+
+
+def test_positions_are_interned():
+    assert name_2_position("e4") is coordinates_2_position((5, 4))
+    assert index_2_position(28) is name_2_position("e4")
+    assert name_2_position("E4") is name_2_position("e4")
+    assert coordinates_2_position((0, 4)) is None
+    assert coordinates_2_position((5, 9)) is None
+    assert len(POSITIONS) == 64
+    assert [str(p) for p in POSITIONS[:9]] == [f"{c}1" for c in "abcdefgh"] + ["a2"]
+
+
+def test_position_equality_and_hash():
+    position = Position(x=LetterPosition(5), y=NumberPosition(4))
+    assert position is not name_2_position("e4")
+    assert position == name_2_position("e4")
+    assert hash(position) == hash(name_2_position("e4"))
+    assert position != name_2_position("e5")
+    assert deepcopy(name_2_position("e4")) is name_2_position("e4")
+
+
+def test_neighbour_and_ray_tables():
+    e4 = name_2_position("e4")
+    assert e4.get_up_position() is name_2_position("e5")
+    assert e4.get_left_down_position() is name_2_position("d3")
+    assert name_2_position("h8").get_right_up_position() is None
+    assert NEIGHBOURS[Direction.RIGHT][e4.index] is name_2_position("f4")
+    assert [str(p) for p in RAYS[Direction.RIGHT_UP][e4.index]] == ["f5", "g6", "h7"]
+    assert RAYS[Direction.DOWN][name_2_position("a1").index] == ()
+
+
+def test_black_pawn_moves_down():
+    pawn = Pawn(color=ChessColor.BLACK, current_position=name_2_position("d7"))
+    coordinates = [p.coordinates for p in pawn.get_possible_positions_to_move()]
+    assert sorted(coordinates) == [(3, 6), (4, 5), (4, 6), (5, 6)]
+
+    pawn = Pawn(color=ChessColor.BLACK, current_position=name_2_position("a4"))
+    coordinates = [p.coordinates for p in pawn.get_possible_positions_to_move()]
+    assert sorted(coordinates) == [(1, 3), (2, 3)]
+
+
+def test_knight_moves_exclude_pieces_of_same_color():
+    knight = Knight(color=ChessColor.WHITE, current_position=name_2_position("g1"))
+    own_occupancy = positions_2_bitboard([name_2_position("e2"), name_2_position("g2")])
+    moves = bitboard_2_positions(knight.get_moves(own_occupancy))
+
+    assert sorted(str(p) for p in moves) == ["f3", "h3"]
+    assert sorted(str(p) for p in knight.get_possible_positions_to_move()) == [
+        "e2",
+        "f3",
+        "h3",
+    ]
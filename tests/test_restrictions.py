@@ -263,3 +263,30 @@ def test_verify_if_path_is_blocked_10():
     assert (
         game.verify_if_path_is_not_blocked_by_another_piece("d6", "b6") == False
     )  # King is blocking the way at c6
+
+
+def test_knight_cannot_jump_to_piece_of_same_color():
+    pieces = [
+        white_knight := Knight(
+            color=ChessColor.WHITE, current_position=coordinates_2_position((2, 1))
+        ),
+        white_pawn := Pawn(
+            color=ChessColor.WHITE, current_position=coordinates_2_position((4, 2))
+        ),
+        white_king := King(
+            color=ChessColor.WHITE, current_position=coordinates_2_position((5, 1))
+        ),
+        black_bishop := Bishop(
+            color=ChessColor.BLACK, current_position=coordinates_2_position((3, 3))
+        ),
+        black_king := King(
+            color=ChessColor.BLACK, current_position=coordinates_2_position((5, 8))
+        ),
+    ]
+
+    game = Game(pieces=pieces)
+
+    assert game.verify_if_piece_can_move_to_location("b1", "d2") == False
+    assert game.verify_if_piece_can_move_to_location("b1", "c3") == True
+    assert game.verify_if_piece_can_move_to_location("b1", "a3") == True
+    assert game.verify_if_piece_can_move_to_location("b1", "b3") == False
@@ -0,0 +1,135 @@
+import time
+
+from chess.game import Game
+from chess.models import ChessColor
+from chess.search import (
+    CHECK_TIME_EVERY_NODES,
+    CLOCK_RESERVE,
+    MATE_SCORE,
+    Search,
+    evaluate,
+    parallel_search,
+    search,
+    time_for_move,
+)
+
+
+def test_finds_mate_in_one():
+    game = Game(fen="6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+
+    result = search(game, max_depth=3)
+    assert repr(result.best_move) == "a1a8"
+    assert result.score == MATE_SCORE - 1
+    # The quiescence search sees the mate at the first iteration
+    assert result.depth == 1
+
+
+def test_wins_hanging_queen():
+    game = Game(fen="4k3/8/8/3q4/8/8/3R4/3K4 w - - 0 1")
+
+    result = search(game, max_depth=2)
+    assert repr(result.best_move) == "d2d5"
+    assert result.principal_variation[0] == result.best_move
+    assert len(result.principal_variation) == 2
+
+
+def test_search_leaves_the_game_untouched():
+    game = Game()
+    game.make_move("e2", "e4")
+    fen = game.fen()
+    key = game.board.zobrist_key
+
+    reports = []
+    result = search(game, max_depth=3, report=reports.append)
+
+    assert [r.depth for r in reports] == [1, 2, 3]
+    assert result.nodes == reports[-1].nodes > 0
+    assert result.nodes_per_second > 0
+    assert game.fen() == fen and game.board.zobrist_key == key
+    assert len(game.board.history) == 1
+    assert game.board.side_to_move == ChessColor.BLACK
+
+
+def test_node_limit_stops_iterative_deepening():
+    game = Game()
+
+    result = Search(game).search(max_depth=10, max_nodes=100)
+    assert result.depth < 10
+    assert result.best_move is not None
+
+
+def test_node_limit_stops_in_the_middle_of_an_iteration():
+    game = Game(fen="r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -")
+    fen = game.fen()
+
+    reports = []
+    searcher = Search(game, move_ordering=False)
+    result = searcher.search(max_depth=3, max_nodes=20000, report=reports.append)
+    assert result.nodes < 20000 + CHECK_TIME_EVERY_NODES
+    assert result.depth == reports[-1].depth < 3
+    assert result.principal_variation == reports[-1].principal_variation
+    assert game.fen() == fen and not game.board.history
+
+
+def test_deadline_stops_in_the_middle_of_an_iteration():
+    game = Game(fen="r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -")
+    fen = game.fen()
+
+    reports = []
+    start = time.perf_counter()
+    result = search(game, max_time=1.0, report=reports.append)
+    assert time.perf_counter() - start < 1.05
+    assert result.best_move is not None
+    # The result is the one of the last completed iteration
+    assert result.depth == reports[-1].depth
+    assert result.principal_variation == reports[-1].principal_variation
+    assert result.nodes >= reports[-1].nodes
+    assert game.fen() == fen and not game.board.history
+
+
+def test_time_for_move():
+    assert time_for_move(60.0) == (60.0 - CLOCK_RESERVE) / 30
+    assert time_for_move(60.0, increment=2.0, moves_to_go=10) == (
+        (60.0 - CLOCK_RESERVE) / 10 + 2.0
+    )
+    # Never more than the time left
+    assert time_for_move(1.0, increment=5.0) == 1.0 - CLOCK_RESERVE
+    assert time_for_move(0.01) == 0.0
+
+    result = search(Game(), clock=0.0)
+    # A first iteration shorter than one poll of the clock completes
+    assert result.depth == 1 and result.best_move is not None
+
+
+def test_deadline_cuts_the_first_iteration():
+    game = Game(fen="r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -")
+    fen = game.fen()
+    moves = list(game.legal_moves())
+
+    reports = []
+    result = search(game, max_time=0.0, report=reports.append)
+    assert not reports and result.depth == 0
+    assert result.best_move in moves
+    assert result.principal_variation == [result.best_move]
+    assert result.nodes <= CHECK_TIME_EVERY_NODES
+    assert game.fen() == fen and not game.board.history
+
+
+def test_stalemate_and_evaluation_scores():
+    game = Game(fen="7k/5K2/6Q1/8/8/8/8/8 b - - 0 1")
+    result = search(game, max_depth=2)
+    assert result.best_move is None and result.score == 0
+
+    assert evaluate(Game().board) == 0
+    assert evaluate(Game(fen="4k3/8/8/8/8/8/8/3QK3 b - - 0 1").board) < -800
+
+
+def test_parallel_search():
+    game = Game(fen="4k3/8/8/3q4/8/8/3R4/3K4 w - - 0 1")
+    fen = game.fen()
+
+    result = parallel_search(game, max_depth=2, max_workers=2)
+    assert repr(result.best_move) == "d2d5"
+    # No worker searches past max_depth
+    assert result.depth == 2
+    assert game.fen() == fen
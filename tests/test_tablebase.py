@@ -0,0 +1,94 @@
+import pickle
+
+import pytest
+
+from chess.game import Game
+from chess.models import ChessColor, ChessException
+from chess.search import MATE_SCORE, search
+from chess.tablebase import (
+    TABLE_EXTENSION,
+    Outcome,
+    Tablebase,
+    TablebaseResult,
+    canonical_material,
+    write_tables,
+)
+
+
+@pytest.fixture(scope="module")
+def tablebase(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("tablebase")
+    write_tables(str(directory), ["KQK"])
+    tablebase = Tablebase(str(directory))
+    yield tablebase
+    tablebase.close()
+
+
+def test_canonical_material():
+    assert canonical_material("KKQ") == "KQK"
+    assert canonical_material("KRKQ") == "KQKR"
+    assert canonical_material("KNBK") == "KBNK"
+    with pytest.raises(ChessException):
+        canonical_material("QKK")
+
+
+def test_longest_mate(tablebase):
+    with open(f"{tablebase.directory}/KQK{TABLE_EXTENSION}", "rb") as file:
+        values = file.read()
+    # Mate in 10 moves at most, the defender is mated after 20 plies
+    assert max(values) - 1 == 20
+    assert max(v for v in values if v % 2 == 0) - 1 == 19
+
+
+def test_probe(tablebase):
+    game = Game(fen="6k1/8/6K1/8/8/8/8/Q7 w - - 0 1", tablebase=tablebase)
+    assert game.probe_tablebase() == TablebaseResult(Outcome.WIN, 1)
+
+    # The table of KQK also answers for the black queen
+    game = Game(fen="q7/8/8/8/8/6k1/8/6K1 b - - 0 1", tablebase=tablebase)
+    assert game.probe_tablebase() == TablebaseResult(Outcome.WIN, 1)
+
+    game = Game(fen="7k/8/6QK/8/8/8/8/8 b - - 0 1", tablebase=tablebase)
+    assert game.probe_tablebase() == TablebaseResult(Outcome.DRAW, None)
+    assert not game.verify_check_mate(ChessColor.BLACK)
+
+    assert Game(tablebase=tablebase).probe_tablebase() is None
+    game = Game(fen="4k3/8/8/8/8/8/8/4K2R w K - 0 1", tablebase=tablebase)
+    assert game.probe_tablebase() is None
+
+
+def test_check_mate_from_the_tablebase(tablebase):
+    game = Game(fen="6k1/8/6K1/8/8/8/8/Q7 w - - 0 1", tablebase=tablebase)
+    game.make_move("a1", "a8")
+
+    assert game.probe_tablebase() == TablebaseResult(Outcome.LOSS, 0)
+    assert game.verify_check_mate(ChessColor.BLACK)
+    assert [
+        str(p.current_position) for p in game.threatening_pieces[ChessColor.BLACK]
+    ] == ["a8"]
+
+
+def test_search_reads_the_tablebase(tablebase):
+    game = Game(fen="8/8/8/4k3/8/8/8/4K2Q w - - 0 1", tablebase=tablebase)
+    plies = game.probe_tablebase().plies
+
+    result = search(game, max_depth=4)
+    # The mate score is exact after one iteration
+    assert result.depth == 1
+    assert result.score == MATE_SCORE - plies
+
+    game.play_move(result.best_move)
+    assert game.probe_tablebase() == TablebaseResult(Outcome.LOSS, plies - 1)
+
+
+def test_tablebase_files(tablebase, tmp_path):
+    assert tablebase.max_pieces == 3
+    copy = pickle.loads(pickle.dumps(tablebase))
+    game = Game(fen="6k1/8/6K1/8/8/8/8/Q7 w - - 0 1", tablebase=copy)
+    assert game.probe_tablebase() == TablebaseResult(Outcome.WIN, 1)
+    copy.close()
+
+    (tmp_path / f"KQK{TABLE_EXTENSION}").write_bytes(b"\0" * 100)
+    game = Game(fen="6k1/8/6K1/8/8/8/8/Q7 w - - 0 1", tablebase=Tablebase(tmp_path))
+    with pytest.raises(ChessException):
+        game.probe_tablebase()
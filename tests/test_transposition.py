@@ -0,0 +1,152 @@
+import pickle
+import tracemalloc
+from random import Random
+
+import pytest
+
+from chess.game import Game
+from chess.models import ChessColor, GameStatus, Move, name_2_position
+from chess.move_generator import generate_legal_moves
+from chess.pieces import Bishop, King, Knight, Queen
+from chess.transposition import (
+    ENTRY_SIZE_IN_BYTES,
+    SharedTranspositionTable,
+    TranspositionTable,
+)
+
+
+def mate_pieces():
+    return [
+        King(color=ChessColor.WHITE, current_position=name_2_position("d6")),
+        Queen(color=ChessColor.WHITE, current_position=name_2_position("c7")),
+        Bishop(color=ChessColor.WHITE, current_position=name_2_position("f3")),
+        King(color=ChessColor.BLACK, current_position=name_2_position("b8")),
+        Knight(color=ChessColor.BLACK, current_position=name_2_position("g5")),
+    ]
+
+
+def test_results_are_reused_across_games():
+    table = TranspositionTable()
+    first_game = Game(pieces=mate_pieces(), transposition_table=table)
+
+    assert first_game.verify_check_mate(king_color=ChessColor.BLACK) == True
+    assert table.hits == 0
+    misses = table.misses
+
+    second_game = Game(pieces=mate_pieces(), transposition_table=table)
+    assert second_game.verify_check_mate(king_color=ChessColor.BLACK) == True
+    assert table.hits == 2  # Check mate and check status
+    assert table.misses == misses
+
+    threatening_pieces = second_game.threatening_pieces[ChessColor.BLACK]
+    assert len(threatening_pieces) == 1
+    assert threatening_pieces[0] is second_game.board.position_map["c7"]
+    assert second_game.verify_if_king_is_in_check(ChessColor.WHITE) == False
+
+
+def test_cached_check_follows_moves():
+    table = TranspositionTable()
+    game = Game(transposition_table=table)
+
+    for origin, destination in [("e2", "e4"), ("f7", "f6"), ("d1", "h5")]:
+        game.make_move(origin, destination)
+
+    assert game.verify_if_king_is_in_check(ChessColor.BLACK) == True
+    assert game.verify_if_king_is_in_check(ChessColor.BLACK) == True
+    assert table.hits >= 1
+    assert game.verify_if_king_is_in_check(ChessColor.WHITE) == False
+
+
+def test_legal_moves_of_the_side_to_move_are_cached():
+    table = TranspositionTable()
+    game = Game(transposition_table=table)
+
+    moves = list(game.legal_moves())
+    assert moves == list(generate_legal_moves(game.board))
+    assert len(moves) == 20 and table.misses == 1
+    assert list(game.legal_moves()) == moves
+    assert table.hits == 1
+
+    # The status is found from the stored moves, then stored too
+    assert game.get_status() == GameStatus.ONGOING
+    assert game.get_status() == GameStatus.ONGOING
+    assert table.hits == 2 and table.misses == 2
+
+    # The moves of the other side are generated and not stored
+    assert len(list(game.legal_moves(ChessColor.BLACK))) == 20
+    assert table.hits == 2 and table.misses == 2
+
+    game.make_move("e2", "e4")
+    assert len(list(game.legal_moves())) == 20
+    assert table.probe(game.board.zobrist_key).legal_moves is not None
+
+
+def test_memory_cap_and_replacement():
+    table = TranspositionTable(max_memory=ENTRY_SIZE_IN_BYTES * 8)
+    assert table.capacity == 8
+
+    for key in range(100):
+        table.get_entry(key)
+
+    stored = [e for bucket in table.buckets for e in bucket if e is not None]
+    assert len(stored) == 8
+    assert table.replacements == 92
+
+    # The most recently used entry of a bucket is kept
+    table.get_entry(96)
+    table.get_entry(100)
+    assert table.probe(96) is not None
+    assert table.probe(100) is not None
+    assert table.probe(92) is None
+
+    table.clear()
+    assert table.probe(96) is None
+
+    # Entries with their legal moves stored stay within the memory cap
+    max_memory = 64 * 1024
+    tracemalloc.start()
+    try:
+        table = TranspositionTable(max_memory=max_memory)
+        start, _ = tracemalloc.get_traced_memory()
+        random = Random(1)
+        for _ in range(10):
+            game = Game(transposition_table=table)
+            for _ in range(40):
+                moves = list(game.legal_moves())
+                if not moves:
+                    break
+                game.play_move(random.choice(moves))
+        game = None
+        used, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert table.replacements > 0
+    assert used - start < max_memory
+
+
+def test_shared_table_is_seen_by_attached_tables():
+    table = SharedTranspositionTable(max_memory=4096)
+    attached = pickle.loads(pickle.dumps(table))
+    try:
+        assert attached.name == table.name and attached.capacity == table.capacity
+        promotion = Move(name_2_position("b7"), name_2_position("a8"), Knight)
+        castling = Move(name_2_position("e1"), name_2_position("g1"), castling=True)
+        table.store_best_move(1, promotion, depth=3)
+        attached.store_best_move(2, castling, depth=1)
+
+        assert attached.probe_best_move(1) == promotion
+        assert table.probe_best_move(2).castling
+        assert table.probe_best_move(1 + table.capacity) is None
+
+        # A shallower result of another position in the bucket keeps the
+        # deepest one and takes the other slot
+        en_passant = Move(name_2_position("e5"), name_2_position("d6"), en_passant=True)
+        table.store_best_move(1 + table.capacity, en_passant, depth=2)
+        assert table.probe_best_move(1) == promotion
+        assert table.probe_best_move(1 + table.capacity).en_passant
+
+        table.clear()
+        assert attached.probe_best_move(1) is None
+    finally:
+        attached.close()
+        table.close()
@@ -0,0 +1,98 @@
+import pytest
+
+from chess.board import Board
+from chess.game import Game
+from chess.models import ChessColor, Move, name_2_position
+
+
+def play(board: Board, moves: list[tuple[str, str]]):
+    for origin, destination in moves:
+        board.move(origin, destination)
+        assert board.zobrist_key == board.compute_zobrist_key()
+
+
+def test_zobrist_key_of_transposed_positions():
+    first_board = Board()
+    first_board.initialize_board()
+    second_board = Board()
+    second_board.initialize_board()
+    initial_key = first_board.zobrist_key
+
+    play(first_board, [("g1", "f3"), ("b8", "c6"), ("b1", "c3")])
+    play(second_board, [("b1", "c3"), ("b8", "c6"), ("g1", "f3")])
+    assert first_board.zobrist_key == second_board.zobrist_key
+
+    play(first_board, [("c6", "b8"), ("f3", "g1"), ("g8", "f6")])
+    assert first_board.zobrist_key != initial_key
+
+    play(first_board, [("c3", "b1")])
+    assert first_board.zobrist_key != initial_key  # Black to move
+
+    play(first_board, [("f6", "g8")])
+    assert first_board.side_to_move == ChessColor.WHITE
+    assert first_board.zobrist_key == initial_key
+
+
+def test_zobrist_key_covers_castling_rights():
+    board = Board()
+    board.initialize_board()
+    play(board, [("e2", "e4"), ("e7", "e5")])
+    key = board.zobrist_key
+    rights = board.castling_rights
+
+    play(board, [("e1", "e2"), ("e8", "e7"), ("e2", "e1"), ("e7", "e8")])
+    assert board.castling_rights == 0
+    assert rights == 15
+    assert board.zobrist_key != key
+
+
+def test_zobrist_key_covers_en_passant():
+    board = Board()
+    board.initialize_board()
+    play(board, [("e2", "e4"), ("a7", "a6"), ("e4", "e5"), ("d7", "d5")])
+    assert str(board.en_passant_position) == "d6"
+    with_en_passant = board.zobrist_key
+
+    other_board = Board()
+    other_board.initialize_board()
+    play(
+        other_board,
+        [("e2", "e4"), ("a7", "a6"), ("e4", "e5"), ("d7", "d6"), ("g1", "f3")],
+    )
+    play(other_board, [("d6", "d5"), ("f3", "g1")])
+    play(other_board, [("a6", "a5"), ("g1", "f3"), ("a5", "a6"), ("f3", "g1")])
+    assert other_board.en_passant_position is None
+    assert other_board.zobrist_key != with_en_passant
+
+
+def test_make_and_unmake_restore_zobrist_key():
+    game = Game()
+    board = game.board
+    play(board, [("e2", "e4"), ("d7", "d5")])
+    key = board.zobrist_key
+
+    for move in [
+        Move(origin=name_2_position("e4"), destination=name_2_position("d5")),
+        Move(origin=name_2_position("g1"), destination=name_2_position("f3")),
+        Move(origin=name_2_position("f2"), destination=name_2_position("f4")),
+    ]:
+        board.make_move(move)
+        assert board.zobrist_key == board.compute_zobrist_key()
+        board.unmake_move()
+        assert board.zobrist_key == key
+
+
+def test_turn_passes_to_the_opponent_of_the_piece_that_moved():
+    game = Game()
+    game.make_move("e2", "e4")
+    game.make_move("d2", "d4")
+    board = game.board
+    assert board.side_to_move == ChessColor.BLACK
+    assert board.fen().split()[1:4] == ["b", "KQkq", "d3"]
+    assert board.zobrist_key == board.compute_zobrist_key()
+
+    board.make_move(Move(name_2_position("g1"), name_2_position("f3")))
+    assert board.zobrist_key == board.compute_zobrist_key()
+    board.unmake_move()
+    assert board.side_to_move == ChessColor.BLACK
+    assert board.zobrist_key == board.compute_zobrist_key()